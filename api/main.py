@@ -1,12 +1,18 @@
+import csv
+import os
+from pathlib import Path
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
 import numpy as np
 
-from src.providers import YFinanceProvider
+from src.providers import AsyncYFinanceProvider, create_provider
+from src.concurrency import AsyncSingleFlight
 from src.models import Timeframe
+from src.panel import OHLCVPanel, default_panel_path
+from src.cache.periods import period_covers, period_start, trim_to_period
 from src.scoring import calculate_stock_score
-from src.indicators import calculate_fibonacci_retracement, calculate_market_bias, calculate_bx_trender
+from src.context import IndicatorContext
 from src.stock_chart import StockChart
 
 # Pattern matching imports
@@ -30,7 +36,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-provider = YFinanceProvider(use_cache=False)
+# TRADER_ALPHA_PROVIDER=replay serves deterministic offline bars (benchmarks, no network).
+provider = AsyncYFinanceProvider(max_concurrency=8, provider=create_provider(use_cache=True))
+
+# Concurrent requests for the same chart share one fetch and one render.
+chart_flights = AsyncSingleFlight()
+
+# Memory-mapped panels written by the scanner; every uvicorn worker maps the
+# same files, so the OS keeps a single physical copy of the bars.
+PANEL_DIR = os.getenv("TRADER_ALPHA_PANEL_DIR")
+_panels = {}
+
+
+def get_panel(timeframe: Timeframe):
+    if PANEL_DIR is None:
+        return None
+    
+    path = default_panel_path(timeframe, PANEL_DIR)
+    if not path.exists():
+        return None
+    
+    mtime = path.stat().st_mtime_ns
+    cached = _panels.get(timeframe)
+    if cached is None or cached[0] != mtime:
+        try:
+            _panels[timeframe] = (mtime, OHLCVPanel.open(path))
+        except (OSError, ValueError) as e:
+            # Rewritten under us; keep serving the snapshot already mapped.
+            print(f"Error opening panel {path}: {e}")
+            return cached[1] if cached else None
+    return _panels[timeframe][1]
+
+
+def panel_covers(panel: OHLCVPanel, df, period: str) -> bool:
+    # Panels hold the scanner's history (2y); longer requests go to the provider.
+    if panel.period is not None:
+        return period_covers(panel.period, period)
+    
+    start = period_start(period)
+    if start is None:
+        return False
+    if df.index.tz is not None:
+        start = start.tz_localize(df.index.tz)
+    return df.index[0] <= start
+
+@app.on_event("shutdown")
+def shutdown_provider():
+    provider.close()
 
 @app.get("/")
 def read_root():
@@ -40,86 +92,103 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/cache/stats")
+def cache_stats():
+    return {
+        "memory": provider.cache_manager.memory_stats() if provider.cache_manager else {},
+        "disk": provider.cache_manager.disk_stats() if provider.cache_manager else {},
+        "quarantine": provider.cache_manager.failure_stats() if provider.cache_manager else {},
+        "remote": provider.cache_manager.remote_stats() if provider.cache_manager else {},
+        "single_flight": {**provider.flight_stats(), "charts": chart_flights.stats()},
+        "upstream": provider.upstream_stats()
+    }
+
 @app.get("/chart/{symbol}", response_class=HTMLResponse)
 async def get_chart(symbol: str):
     try:
         symbol = symbol.upper()
-        
-        df_daily = provider.get_stock_data(symbol, Timeframe.DAILY, period="2y")
-        df_weekly = provider.get_stock_data(symbol, Timeframe.WEEKLY, period="2y")
-        df_monthly = provider.get_stock_data(symbol, Timeframe.MONTHLY, period="2y")
-        
-        if df_daily.empty or df_weekly.empty or df_monthly.empty:
-            raise HTTPException(status_code=404, detail=f"No data found for symbol {symbol}")
-        
-        score = calculate_stock_score(symbol, df_monthly, df_weekly, df_daily)
-        fib_result = calculate_fibonacci_retracement(df_daily, lookback=50)
-        
-        bias_high_monthly, bias_low_monthly = calculate_market_bias(df_monthly, ha_len=20, ha_len2=7)
-        bias_high_weekly, bias_low_weekly = calculate_market_bias(df_weekly, ha_len=20, ha_len2=7)
-        
-        bx_monthly = calculate_bx_trender(df_monthly, use_short=True, apply_t3=False)
-        bx_weekly = calculate_bx_trender(df_weekly, use_short=True, apply_t3=False)
-        
-        score_data = {
-            "total_score": score.score_breakdown.total_score,
-            "passed_filter": score.score_breakdown.passed_filter,
-            "market_bias_score": score.score_breakdown.market_bias_score,
-            "market_bias_timeframe": score.score_breakdown.market_bias_timeframe.value if score.score_breakdown.market_bias_timeframe else None,
-            "fibonacci_score": score.score_breakdown.fibonacci_score,
-            "fibonacci_zone": score.score_breakdown.fibonacci_zone.value if score.score_breakdown.fibonacci_zone else None,
-            "bx_trender_color": score.score_breakdown.bx_trender_color.value if score.score_breakdown.bx_trender_color else None,
-        }
-        
-        chart = StockChart(symbol, df_daily)
-        chart.set_score_data(score_data)
-        chart.create_base_chart(with_bx_trender=True, bx_rows=3)
-        
-        chart.add_market_bias(
-            bias_high_monthly, 
-            bias_low_monthly,
-            name="Monthly Market Bias",
-            df_index=df_monthly.index,
-            resample_to_daily=True,
-            color='blue'
-        )
-        
-        chart.add_market_bias(
-            bias_high_weekly,
-            bias_low_weekly,
-            name="Weekly Market Bias",
-            df_index=df_weekly.index,
-            resample_to_daily=True,
-            color='green'
-        )
-        
-        if fib_result and fib_result.swing_high and fib_result.swing_low:
-            chart.add_fibonacci(
-                float(fib_result.swing_high),
-                float(fib_result.swing_low),
-                show_all_levels=True
-            )
-        
-        chart.add_bx_trender(bx_monthly, row=2, name="Monthly BX-Trender", df_index=df_monthly.index, resample_to_daily=True)
-        chart.add_bx_trender(bx_weekly, row=3, name="Weekly BX-Trender", df_index=df_weekly.index, resample_to_daily=True)
-        
-        chart.add_score_annotation()
-        
-        html_content = chart.fig.to_html(include_plotlyjs='cdn', full_html=True)
-        
+        html_content = await chart_flights.do(symbol, render_chart, symbol)
         return HTMLResponse(content=html_content)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating chart: {str(e)}")
 
 
-# Default list of popular stocks to search if none provided
-DEFAULT_STOCK_SYMBOLS = [
-    "AAPL", "MSFT", "GOOGL", "AMZN", "META", "TSLA", "NVDA", "JPM",
-    "V", "WMT", "JNJ", "PG", "MA", "HD", "DIS", "NFLX", "PYPL", "ADBE",
-    "CRM", "CSCO", "INTC", "AMD", "QCOM", "TXN", "ORCL", "IBM", "UBER",
-    "BA", "GE", "CAT"
-]
+async def render_chart(symbol: str) -> str:
+    frames = await provider.get_stock_timeframes(
+        symbol, [Timeframe.DAILY, Timeframe.WEEKLY, Timeframe.MONTHLY], period="2y"
+    )
+    df_daily = frames[Timeframe.DAILY]
+    df_weekly = frames[Timeframe.WEEKLY]
+    df_monthly = frames[Timeframe.MONTHLY]
+    
+    if df_daily.empty or df_weekly.empty or df_monthly.empty:
+        raise HTTPException(status_code=404, detail=f"No data found for symbol {symbol}")
+    
+    # The chart reuses what scoring computed: each indicator runs once.
+    context = IndicatorContext()
+    score = calculate_stock_score(symbol, df_monthly, df_weekly, df_daily, context=context)
+    fib_result = context.fibonacci_retracement(df_daily, lookback=50)
+    
+    bias_high_monthly, bias_low_monthly = context.market_bias(df_monthly, ha_len=20, ha_len2=7)
+    bias_high_weekly, bias_low_weekly = context.market_bias(df_weekly, ha_len=20, ha_len2=7)
+    
+    bx_monthly = context.bx_trender(df_monthly, use_short=True, apply_t3=False)
+    bx_weekly = context.bx_trender(df_weekly, use_short=True, apply_t3=False)
+    
+    score_data = {
+        "total_score": score.score_breakdown.total_score,
+        "passed_filter": score.score_breakdown.passed_filter,
+        "market_bias_score": score.score_breakdown.market_bias_score,
+        "market_bias_timeframe": score.score_breakdown.market_bias_timeframe.value if score.score_breakdown.market_bias_timeframe else None,
+        "fibonacci_score": score.score_breakdown.fibonacci_score,
+        "fibonacci_zone": score.score_breakdown.fibonacci_zone.value if score.score_breakdown.fibonacci_zone else None,
+        "bx_trender_color": score.score_breakdown.bx_trender_color.value if score.score_breakdown.bx_trender_color else None,
+    }
+    
+    chart = StockChart(symbol, df_daily)
+    chart.set_score_data(score_data)
+    chart.create_base_chart(with_bx_trender=True, bx_rows=3)
+    
+    chart.add_market_bias(
+        bias_high_monthly, 
+        bias_low_monthly,
+        name="Monthly Market Bias",
+        df_index=df_monthly.index,
+        resample_to_daily=True,
+        color='blue'
+    )
+    
+    chart.add_market_bias(
+        bias_high_weekly,
+        bias_low_weekly,
+        name="Weekly Market Bias",
+        df_index=df_weekly.index,
+        resample_to_daily=True,
+        color='green'
+    )
+    
+    if fib_result and fib_result.swing_high and fib_result.swing_low:
+        chart.add_fibonacci(
+            float(fib_result.swing_high),
+            float(fib_result.swing_low),
+            show_all_levels=True
+        )
+    
+    chart.add_bx_trender(bx_monthly, row=2, name="Monthly BX-Trender", df_index=df_monthly.index, resample_to_daily=True)
+    chart.add_bx_trender(bx_weekly, row=3, name="Weekly BX-Trender", df_index=df_weekly.index, resample_to_daily=True)
+    
+    chart.add_score_annotation()
+    
+    return chart.fig.to_html(include_plotlyjs='cdn', full_html=True)
+
+
+# Default list of popular stocks to search if none provided. Kept in a CSV so
+# the cache warm-up daemon can prefetch the same symbols.
+DEFAULT_SYMBOLS_FILE = Path(__file__).parent / "default_symbols.csv"
+
+with open(DEFAULT_SYMBOLS_FILE) as f:
+    DEFAULT_STOCK_SYMBOLS = [row["symbol"].strip().upper() for row in csv.DictReader(f) if row["symbol"].strip()]
 
 
 @app.post("/pattern/match", response_model=PatternMatchResponse)
@@ -179,15 +248,24 @@ async def match_pattern(request: PatternMatchRequest):
         # Fetch historical data for all symbols
         print(f"Fetching data for {len(symbols_to_search)} symbols...")
         stock_data = {}
+        panel = get_panel(timeframe)
+
+        missing_symbols = []
 
         for symbol in symbols_to_search:
-            try:
-                df = provider.get_stock_data(symbol, timeframe, period=request.period)
-                if not df.empty and len(df) >= request.num_points:
-                    stock_data[symbol] = df
-            except Exception as e:
-                print(f"Error fetching data for {symbol}: {str(e)}")
+            df = panel.get(symbol) if panel is not None else None
+            if df is None or not panel_covers(panel, df, request.period):
+                missing_symbols.append(symbol)
                 continue
+            df = trim_to_period(df, request.period)
+            if not df.empty and len(df) >= request.num_points:
+                stock_data[symbol] = df
+
+        # Remaining symbols are fetched concurrently instead of one by one
+        fetched = await provider.get_multiple_stocks(missing_symbols, timeframe, period=request.period)
+        for symbol, df in fetched.items():
+            if len(df) >= request.num_points:
+                stock_data[symbol] = df
 
         if not stock_data:
             return PatternMatchResponse(
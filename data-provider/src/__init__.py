@@ -1,12 +1,31 @@
-from .models import Timeframe, StockDataRequest, CacheMetadata
-from .providers import BaseDataProvider, YFinanceProvider
+from .models import Timeframe, StockDataRequest, CacheMetadata, SymbolFailure
+from .providers import (
+    BaseDataProvider,
+    YFinanceProvider,
+    ReplayDataProvider,
+    AsyncBaseDataProvider,
+    AsyncYFinanceProvider,
+    create_provider
+)
 from .cache import CacheManager
+from .panel import OHLCVPanel
+from .concurrency import SingleFlight, AsyncSingleFlight
+from .market import MarketCalendar
 
 __all__ = [
     'Timeframe',
     'StockDataRequest',
     'CacheMetadata',
+    'SymbolFailure',
     'BaseDataProvider',
     'YFinanceProvider',
-    'CacheManager'
+    'ReplayDataProvider',
+    'AsyncBaseDataProvider',
+    'AsyncYFinanceProvider',
+    'create_provider',
+    'CacheManager',
+    'OHLCVPanel',
+    'SingleFlight',
+    'AsyncSingleFlight',
+    'MarketCalendar'
 ]
\ No newline at end of file
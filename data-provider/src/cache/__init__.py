@@ -1,3 +1,9 @@
 from .cache_manager import CacheManager
+from .cache_index import CacheIndex
+from .memory_cache import MemoryCache
+from .remote import BlobStore, DirectoryBlobStore, HttpBlobStore, open_blob_store
 
-__all__ = ['CacheManager']
\ No newline at end of file
+__all__ = [
+    'CacheManager', 'CacheIndex', 'MemoryCache',
+    'BlobStore', 'DirectoryBlobStore', 'HttpBlobStore', 'open_blob_store'
+]
\ No newline at end of file
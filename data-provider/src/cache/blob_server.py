@@ -0,0 +1,94 @@
+import argparse
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from .remote import DirectoryBlobStore
+
+
+def make_blob_server(
+    root: str,
+    port: int,
+    host: str = "0.0.0.0",
+    token: Optional[str] = None
+) -> ThreadingHTTPServer:
+    # Minimal GET/PUT/HEAD front for a DirectoryBlobStore, enough for a few
+    # nodes on a LAN; anything speaking the same verbs can replace it.
+    store = DirectoryBlobStore(root)
+
+    class BlobHandler(BaseHTTPRequestHandler):
+        def _key(self) -> Optional[str]:
+            if token and self.headers.get("Authorization") != f"Bearer {token}":
+                self.send_error(401)
+                return None
+            try:
+                store._path(self.path.lstrip("/"))
+            except ValueError:
+                self.send_error(400)
+                return None
+            return self.path.lstrip("/")
+
+        def do_GET(self):
+            key = self._key()
+            if key is None:
+                return
+            data = store.get(key)
+            if data is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_HEAD(self):
+            key = self._key()
+            if key is None:
+                return
+            if not store.exists(key):
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_PUT(self):
+            key = self._key()
+            if key is None:
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            store.put(key, self.rfile.read(length))
+            self.send_response(201)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), BlobHandler)
+
+
+def serve_blobs(root: str, port: int, host: str = "0.0.0.0", token: Optional[str] = None) -> ThreadingHTTPServer:
+    server = make_blob_server(root, port, host, token)
+    threading.Thread(target=server.serve_forever, name="blob-server", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a shared market data cache over HTTP")
+    parser.add_argument("--root", required=True, help="Directory holding the blobs")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = make_blob_server(args.root, args.port, args.host, os.getenv("TRADER_ALPHA_REMOTE_CACHE_TOKEN"))
+    print(f"Serving {args.root} on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
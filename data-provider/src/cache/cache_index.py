@@ -0,0 +1,294 @@
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from ..models import Timeframe, CacheMetadata, SymbolFailure
+
+
+SCHEMA_VERSION = 4
+
+_COLUMNS = (
+    "symbol", "timeframe", "period", "bucket", "rows", "bytes",
+    "first_bar", "last_bar", "tz", "cached_at", "file_path",
+)
+
+
+class CacheIndex:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        # Scanner shards and API workers share the file; wait out their writes.
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self.reset = False
+        self._migrate()
+    
+    def _migrate(self) -> None:
+        if self._user_version() == SCHEMA_VERSION:
+            return
+        
+        with self._lock:
+            # Take the write lock before re-reading the version, so processes
+            # opening the same cache at once migrate it only once.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._upgrade(self._user_version())
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+    
+    def _user_version(self) -> int:
+        return self._conn.execute("PRAGMA user_version").fetchone()[0]
+    
+    def _upgrade(self, version: int) -> None:
+        if version == SCHEMA_VERSION:
+            return
+        
+        if version < 2:
+            # Older layouts describe files in an older format, so the owner
+            # has to drop the data along with them.
+            self.reset = version != 0
+            self._conn.execute("DROP TABLE IF EXISTS entries")
+            self._conn.execute("""
+                CREATE TABLE entries (
+                    symbol TEXT NOT NULL,
+                    timeframe TEXT NOT NULL,
+                    period TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    rows INTEGER NOT NULL,
+                    bytes INTEGER NOT NULL,
+                    first_bar TEXT,
+                    last_bar TEXT,
+                    tz TEXT,
+                    cached_at REAL NOT NULL,
+                    file_path TEXT NOT NULL,
+                    PRIMARY KEY (timeframe, symbol)
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_cached_at ON entries (cached_at)")
+        
+        # Files written before checksums existed have no row and are read unverified.
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                timeframe TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                checksum TEXT NOT NULL,
+                PRIMARY KEY (timeframe, bucket)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS failures (
+                symbol TEXT PRIMARY KEY,
+                failures INTEGER NOT NULL,
+                last_error TEXT,
+                first_failed_at REAL NOT NULL,
+                last_failed_at REAL NOT NULL,
+                blocked_until REAL NOT NULL
+            )
+        """)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    def _row_to_entry(self, row: tuple) -> CacheMetadata:
+        values = dict(zip(_COLUMNS, row))
+        values["timeframe"] = Timeframe(values["timeframe"])
+        values["cached_at"] = datetime.fromtimestamp(values["cached_at"]).isoformat()
+        return CacheMetadata(**values)
+    
+    def _select(self, where: str = "", params: tuple = ()) -> List[CacheMetadata]:
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM entries {where}"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+    
+    def get(self, symbol: str, timeframe: Timeframe) -> Optional[CacheMetadata]:
+        entries = self._select("WHERE timeframe = ? AND symbol = ?", (timeframe.value, symbol))
+        return entries[0] if entries else None
+    
+    def get_many(self, symbols: Iterable[str], timeframe: Timeframe) -> Dict[str, CacheMetadata]:
+        symbols = list(symbols)
+        entries = {}
+        # Stay well under SQLite's host-parameter limit.
+        for i in range(0, len(symbols), 500):
+            chunk = symbols[i:i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for entry in self._select(
+                f"WHERE timeframe = ? AND symbol IN ({placeholders})",
+                (timeframe.value, *chunk)
+            ):
+                entries[entry.symbol] = entry
+        return entries
+    
+    def entries(self, timeframe: Optional[Timeframe] = None) -> List[CacheMetadata]:
+        if timeframe is None:
+            return self._select()
+        return self._select("WHERE timeframe = ?", (timeframe.value,))
+    
+    def upsert_many(self, entries: List[CacheMetadata]) -> None:
+        rows = [
+            (
+                entry.symbol, entry.timeframe.value, entry.period, entry.bucket, entry.rows,
+                entry.bytes, entry.first_bar, entry.last_bar, entry.tz,
+                datetime.fromisoformat(entry.cached_at).timestamp(), entry.file_path,
+            )
+            for entry in entries
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO entries ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                rows
+            )
+    
+    def delete_many(self, keys: List[Tuple[str, str]]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM entries WHERE symbol = ? AND timeframe = ?", keys)
+    
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM files")
+    
+    def get_checksum(self, timeframe: str, bucket: int) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT checksum FROM files WHERE timeframe = ? AND bucket = ?", (timeframe, bucket)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def set_checksum(self, timeframe: str, bucket: int, checksum: Optional[str]) -> None:
+        with self._lock, self._conn:
+            if checksum is None:
+                self._conn.execute("DELETE FROM files WHERE timeframe = ? AND bucket = ?", (timeframe, bucket))
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO files (timeframe, bucket, checksum) VALUES (?, ?, ?)",
+                    (timeframe, bucket, checksum)
+                )
+    
+    def fresh_periods(self, symbols: Iterable[str], timeframe: Timeframe, since: datetime) -> Dict[str, str]:
+        symbols = list(symbols)
+        fresh = {}
+        for i in range(0, len(symbols), 500):
+            chunk = symbols[i:i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT symbol, period FROM entries WHERE timeframe = ? AND cached_at >= ? "
+                    f"AND symbol IN ({placeholders})",
+                    (timeframe.value, since.timestamp(), *chunk)
+                ).fetchall()
+            fresh.update(rows)
+        return fresh
+    
+    def stale_symbols(self, timeframe: Timeframe, since: datetime) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT symbol FROM entries WHERE timeframe = ? AND cached_at < ? ORDER BY symbol",
+                (timeframe.value, since.timestamp())
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def older_than(self, cutoff: datetime) -> List[CacheMetadata]:
+        return self._select("WHERE cached_at < ?", (cutoff.timestamp(),))
+    
+    def failure_counts(self, symbols: Iterable[str]) -> Dict[str, Tuple[int, float]]:
+        symbols = list(symbols)
+        counts = {}
+        for i in range(0, len(symbols), 500):
+            chunk = symbols[i:i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT symbol, failures, first_failed_at FROM failures WHERE symbol IN ({placeholders})",
+                    chunk
+                ).fetchall()
+            counts.update((symbol, (failures, first)) for symbol, failures, first in rows)
+        return counts
+    
+    def upsert_failures(self, failures: List[SymbolFailure]) -> None:
+        rows = [
+            (
+                failure.symbol, failure.failures, failure.last_error,
+                datetime.fromisoformat(failure.first_failed_at).timestamp(),
+                datetime.fromisoformat(failure.last_failed_at).timestamp(),
+                datetime.fromisoformat(failure.blocked_until).timestamp(),
+            )
+            for failure in failures
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO failures "
+                "(symbol, failures, last_error, first_failed_at, last_failed_at, blocked_until) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+    
+    def delete_failures(self, symbols: Iterable[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM failures WHERE symbol = ?", [(symbol,) for symbol in symbols])
+    
+    def blocked_symbols(self, symbols: Iterable[str], now: datetime) -> Set[str]:
+        symbols = list(symbols)
+        blocked = set()
+        for i in range(0, len(symbols), 500):
+            chunk = symbols[i:i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT symbol FROM failures WHERE blocked_until > ? AND symbol IN ({placeholders})",
+                    (now.timestamp(), *chunk)
+                ).fetchall()
+            blocked.update(row[0] for row in rows)
+        return blocked
+    
+    def failures(self) -> List[SymbolFailure]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT symbol, failures, last_error, first_failed_at, last_failed_at, blocked_until "
+                "FROM failures ORDER BY failures DESC, symbol"
+            ).fetchall()
+        return [
+            SymbolFailure(
+                symbol=symbol,
+                failures=failures,
+                last_error=last_error,
+                first_failed_at=datetime.fromtimestamp(first).isoformat(),
+                last_failed_at=datetime.fromtimestamp(last).isoformat(),
+                blocked_until=datetime.fromtimestamp(until).isoformat()
+            )
+            for symbol, failures, last_error, first, last, until in rows
+        ]
+    
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM entries").fetchone()[0]
+    
+    def eviction_candidates(self, bytes_to_free: int) -> List[CacheMetadata]:
+        # Oldest fetches first, until their sizes add up to what has to go.
+        sql = f"""
+            SELECT {', '.join(_COLUMNS)} FROM (
+                SELECT *, SUM(bytes) OVER (ORDER BY cached_at, timeframe, symbol) AS running
+                FROM entries
+            ) WHERE running - bytes < ? ORDER BY cached_at
+        """
+        with self._lock:
+            rows = self._conn.execute(sql, (bytes_to_free,)).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+    
+    def timezones(self, timeframe: Timeframe) -> Set[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT tz FROM entries WHERE timeframe = ? AND tz IS NOT NULL", (timeframe.value,)
+            ).fetchall()
+        return {row[0] for row in rows}
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
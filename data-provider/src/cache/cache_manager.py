@@ -1,13 +1,36 @@
-import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+import pyarrow as pa
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
-from ..models import Timeframe
+from typing import Dict, List, Optional, Tuple
+from ..models import Timeframe, CacheMetadata, SymbolFailure
+from ..market import MarketCalendar
+from .cache_index import CacheIndex
+from .dataset import COMPACT_SCHEMA, SCHEMA, PartitionedDataset, block_to_table, frames_to_table, table_to_frames
+from .memory_cache import MemoryCache
+from .periods import period_covers, period_start, trim_to_period
+from .remote import BlobStore, blob_key, blob_to_table, content_digest, range_hash, ref_key, table_to_blob
 
 
 class CacheManager:
-    def __init__(self, cache_dir: Optional[str] = None):
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        num_buckets: int = 32,
+        memory_bytes: int = 256 * 1024 * 1024,
+        calendar: Optional[MarketCalendar] = None,
+        negative_ttl_hours: float = 6,
+        quarantine_after: int = 3,
+        quarantine_days: float = 7,
+        max_quarantine_days: float = 90,
+        compact: bool = False,
+        remote: Optional[BlobStore] = None
+    ):
         if cache_dir is None:
             self.cache_dir = Path.home() / ".trader-alpha" / "cache"
         else:
@@ -15,55 +38,563 @@ class CacheManager:
         
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+        # Entries stay valid until the next session can change the bar; while a
+        # session is open, the forming bar is refreshed after these many hours.
+        self.calendar = calendar or MarketCalendar()
         self.ttl_hours = {
             Timeframe.DAILY: 6,
             Timeframe.WEEKLY: 24,
-            Timeframe.MONTHLY: 72
+            Timeframe.MONTHLY: 72,
+            Timeframe.SIX_MONTH: 72
         }
+        
+        # A symbol that comes back empty is skipped for negative_ttl_hours; after
+        # quarantine_after failures in a row it is quarantined, for twice as
+        # long on each further failure.
+        self.negative_ttl = timedelta(hours=negative_ttl_hours)
+        self.quarantine_after = quarantine_after
+        self.quarantine_ttl = timedelta(days=quarantine_days)
+        self.max_quarantine = timedelta(days=max_quarantine_days)
+        
+        # Compact mode stores and serves float32 prices and integer volume.
+        self.compact = compact
+        self.index = CacheIndex(self.cache_dir / "index.sqlite")
+        self.dataset = PartitionedDataset(
+            self.cache_dir / "dataset", num_buckets, checksums=self.index,
+            schema=COMPACT_SCHEMA if compact else SCHEMA
+        )
+        
+        # Bars from older cache layouts (manifest.json, per-period entries)
+        # can't be read by this one; they are refetched on demand.
+        legacy_manifest = self.cache_dir / "manifest.json"
+        if self.index.reset or legacy_manifest.exists():
+            shutil.rmtree(self.dataset.root, ignore_errors=True)
+            self.dataset.root.mkdir(parents=True, exist_ok=True)
+            legacy_manifest.unlink(missing_ok=True)
+        self.memory = MemoryCache(memory_bytes) if memory_bytes > 0 else None
+        self._lock = threading.RLock()
+        
+        # Optional tier shared by every node: bars written here are pushed to
+        # it in the background, and stale symbols are pulled from it before
+        # anyone asks Yahoo again.
+        self.remote = remote
+        self._remote_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="remote-cache") if remote else None
+        self._pushes: List[Future] = []
+        self.remote_counts = {"pushed": 0, "pulled": 0, "push_errors": 0, "pull_errors": 0}
     
-    def _get_cache_path(self, symbol: str, timeframe: Timeframe, period: str) -> Path:
-        today = datetime.now().strftime("%Y%m%d")
-        filename = f"{symbol}_{timeframe.value}_{period}_{today}.parquet"
-        return self.cache_dir / filename
+    def _get_entry(self, symbol: str, timeframe: Timeframe, period: str) -> Optional[CacheMetadata]:
+        # One entry per symbol/timeframe holds the longest history fetched so
+        # far; any shorter period is a slice of it.
+        entry = self.index.get(symbol, timeframe)
+        if entry is None or not period_covers(entry.period, period):
+            return None
+        return entry
     
-    def _is_cache_valid(self, file_path: Path, timeframe: Timeframe) -> bool:
-        if not file_path.exists():
+    def _is_cache_valid(self, entry: Optional[CacheMetadata], timeframe: Timeframe) -> bool:
+        if entry is None:
             return False
         
-        file_mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
+        cached_at = datetime.fromisoformat(entry.cached_at).astimezone()
+        return cached_at >= self._fresh_since(timeframe)
+    
+    def is_fresh(self, symbol: str, timeframe: Timeframe, period: str) -> bool:
+        return self._is_cache_valid(self._get_entry(symbol, timeframe, period), timeframe)
+    
+    def _fresh_since(self, timeframe: Timeframe) -> datetime:
         ttl = timedelta(hours=self.ttl_hours[timeframe])
-        
-        return datetime.now() - file_mtime < ttl
+        return self.calendar.fresh_since(datetime.now(timezone.utc), ttl)
+    
+    def fresh_symbols(self, symbols: List[str], timeframe: Timeframe, period: str) -> set:
+        fresh = self.index.fresh_periods(symbols, timeframe, self._fresh_since(timeframe))
+        return {symbol for symbol, stored in fresh.items() if period_covers(stored, period)}
+    
+    def stale_symbols(self, timeframe: Timeframe) -> List[str]:
+        return self.index.stale_symbols(timeframe, self._fresh_since(timeframe))
     
     def get(self, symbol: str, timeframe: Timeframe, period: str) -> Optional[pd.DataFrame]:
-        cache_path = self._get_cache_path(symbol, timeframe, period)
+        if self.is_fresh(symbol, timeframe, period):
+            return self.load(symbol, timeframe, period)
+        
+        return None
+    
+    def load(self, symbol: str, timeframe: Timeframe, period: str) -> Optional[pd.DataFrame]:
+        return self.load_many([symbol], timeframe, period).get(symbol)
+    
+    def _memory_key(self, entry: CacheMetadata) -> tuple:
+        # cached_at changes on every write, including another process's refresh
+        # of a forming bar that keeps the same last_bar.
+        return (entry.symbol, entry.timeframe.value, (entry.last_bar, entry.cached_at))
+    
+    def load_many(self, symbols: List[str], timeframe: Timeframe, period: str) -> Dict[str, pd.DataFrame]:
+        entries = {
+            symbol: entry for symbol, entry in self.index.get_many(symbols, timeframe).items()
+            if period_covers(entry.period, period)
+        }
+        frames = self._load_history(entries, timeframe)
+        return {symbol: trim_to_period(df, period) for symbol, df in frames.items()}
+    
+    def _load_history(self, entries: Dict[str, CacheMetadata], timeframe: Timeframe) -> Dict[str, pd.DataFrame]:
+        frames = {}
+        missing = {}
+        for symbol, entry in entries.items():
+            df = self.memory.get(self._memory_key(entry)) if self.memory else None
+            if df is not None:
+                frames[symbol] = df
+            else:
+                missing[symbol] = entry
+        
+        if not missing:
+            return frames
         
-        if self._is_cache_valid(cache_path, timeframe):
+        try:
+            table = self.dataset.read(timeframe.value, list(missing))
+        except Exception as e:
+            print(f"Error reading cache: {e}")
+            return frames
+        
+        disk_frames = table_to_frames(
+            table, {symbol: entry.tz for symbol, entry in missing.items()}, compact=self.compact
+        )
+        if self.memory:
+            for symbol, df in disk_frames.items():
+                self.memory.put(self._memory_key(missing[symbol]), df)
+                disk_frames[symbol] = df.copy(deep=False)
+        
+        frames.update(disk_frames)
+        return frames
+    
+    def memory_stats(self) -> dict:
+        return self.memory.stats() if self.memory else {}
+    
+    def disk_stats(self) -> dict:
+        return {"entries": self.index.count(), "bytes": self.index.total_bytes()}
+    
+    def read_table(self, timeframe: Timeframe, symbols: Optional[List[str]] = None, period: Optional[str] = None):
+        since = period_start(period) if period is not None else None
+        return self.dataset.read(timeframe.value, symbols, since)
+    
+    def get_last_bar(self, symbol: str, timeframe: Timeframe) -> Optional[pd.Timestamp]:
+        entry = self.index.get(symbol, timeframe)
+        
+        if entry is None or entry.last_bar is None:
+            return None
+        
+        return pd.Timestamp(entry.last_bar)
+    
+    def set(self, symbol: str, timeframe: Timeframe, period: str, data: pd.DataFrame) -> None:
+        self.set_many(timeframe, period, {symbol: data})
+    
+    def set_many(self, timeframe: Timeframe, period: str, frames: Dict[str, pd.DataFrame]) -> None:
+        try:
+            table, timezones = frames_to_table(frames, self.dataset.schema)
+        except Exception as e:
+            print(f"Error writing cache: {e}")
+            return
+        
+        spans = {
+            symbol: (len(df), df.index[0] if len(df) else None, df.index[-1] if len(df) else None)
+            for symbol, df in frames.items()
+        }
+        self._write(timeframe, period, table, timezones, spans)
+    
+    def set_panels(self, timeframe: Timeframe, period: str, panels: List) -> None:
+        # Bulk path for a downloaded batch kept as blocks (OHLCVPanels, one per
+        # chunk): the whole batch becomes a single Arrow table and one write
+        # per bucket, without going through a DataFrame per symbol.
+        tables = []
+        timezones = {}
+        spans = {}
+        
+        for panel in panels:
             try:
-                df = pd.read_parquet(cache_path)
-                return df
+                tables.append(block_to_table(panel.values, panel.symbols, panel.dates, self.dataset.schema))
             except Exception as e:
-                print(f"Error reading cache: {e}")
-                return None
+                print(f"Error writing cache: {e}")
+                return
+            
+            present = ~np.isnan(panel.field('close'))
+            rows = present.sum(axis=1)
+            first = present.argmax(axis=1)
+            last = present.shape[1] - 1 - present[:, ::-1].argmax(axis=1)
+            tz = str(panel.dates.tz) if panel.dates.tz is not None else None
+            
+            for i, symbol in enumerate(panel.symbols):
+                if rows[i]:
+                    spans[symbol] = (int(rows[i]), panel.dates[first[i]], panel.dates[last[i]])
+                    timezones[symbol] = tz
         
-        return None
+        if tables:
+            self._write(timeframe, period, pa.concat_tables(tables), timezones, spans)
     
-    def set(self, symbol: str, timeframe: Timeframe, period: str, data: pd.DataFrame) -> None:
-        cache_path = self._get_cache_path(symbol, timeframe, period)
+    def _write(
+        self,
+        timeframe: Timeframe,
+        period: str,
+        table: pa.Table,
+        timezones: Dict[str, Optional[str]],
+        spans: Dict[str, Tuple[int, Optional[pd.Timestamp], Optional[pd.Timestamp]]],
+        cached_at: Optional[Dict[str, str]] = None,
+        push: bool = True
+    ) -> None:
+        # `table` holds the rows of each symbol in `spans` together and in
+        # that order; one stable sort groups them by bucket, and every bucket
+        # gets a zero-copy slice.
+        symbols = list(spans)
+        unsorted = table
+        symbol_buckets = np.array([self.dataset.bucket_of(symbol) for symbol in symbols], dtype=np.int64)
+        row_buckets = np.repeat(symbol_buckets, [spans[symbol][0] for symbol in symbols])
+        order = np.argsort(row_buckets, kind='stable')
+        table = table.take(pa.array(order))
+        row_buckets = row_buckets[order]
+        
+        by_bucket: Dict[int, List[str]] = defaultdict(list)
+        for symbol, bucket in zip(symbols, symbol_buckets.tolist()):
+            by_bucket[bucket].append(symbol)
         
+        with self._lock:
+            now = datetime.now().isoformat()
+            cached_at = cached_at or {}
+            entries = []
+            
+            for bucket, bucket_symbols in by_bucket.items():
+                start, stop = np.searchsorted(row_buckets, [bucket, bucket + 1])
+                try:
+                    bucket_rows, bucket_bytes = self.dataset.replace(
+                        timeframe.value, bucket, bucket_symbols, table.slice(start, stop - start)
+                    )
+                except Exception as e:
+                    print(f"Error writing cache: {e}")
+                    continue
+                
+                file_path = str(self.dataset.bucket_path(timeframe.value, bucket))
+                for symbol in bucket_symbols:
+                    rows, first_bar, last_bar = spans[symbol]
+                    entries.append(CacheMetadata(
+                        symbol=symbol,
+                        timeframe=timeframe,
+                        period=period,
+                        cached_at=cached_at.get(symbol, now),
+                        file_path=file_path,
+                        bucket=bucket,
+                        rows=rows,
+                        # Entries share a bucket file; charge each its share of it.
+                        bytes=bucket_bytes * rows // bucket_rows if bucket_rows else 0,
+                        first_bar=first_bar.isoformat() if first_bar is not None else None,
+                        last_bar=last_bar.isoformat() if last_bar is not None else None,
+                        tz=timezones.get(symbol)
+                    ))
+                    if self.memory:
+                        self.memory.discard((symbol, timeframe.value))
+            
+            self.index.upsert_many(entries)
+        
+        if self.remote and push:
+            self._push(timeframe, unsorted, entries, spans)
+    
+    def _push(
+        self,
+        timeframe: Timeframe,
+        table: pa.Table,
+        entries: List[CacheMetadata],
+        spans: Dict[str, Tuple[int, Optional[pd.Timestamp], Optional[pd.Timestamp]]]
+    ) -> None:
+        offsets = {}
+        offset = 0
+        for symbol, (rows, _, _) in spans.items():
+            offsets[symbol] = offset
+            offset += rows
+        
+        with self._lock:
+            self._pushes = [future for future in self._pushes if not future.done()]
+            for entry in entries:
+                if not entry.rows:
+                    continue
+                rows = table.slice(offsets[entry.symbol], entry.rows)
+                self._pushes.append(self._remote_pool.submit(self._push_entry, entry, rows))
+    
+    def _push_entry(self, entry: CacheMetadata, rows: pa.Table) -> None:
         try:
-            data.to_parquet(cache_path, index=True)
+            data = table_to_blob(rows)
+            digest = content_digest(data)
+            key = blob_key(
+                entry.symbol, entry.timeframe.value,
+                range_hash(entry.first_bar, entry.last_bar, entry.rows), digest
+            )
+            # Blobs are immutable; the ref is written last so it never points
+            # at a blob that isn't there yet.
+            if not self.remote.exists(key):
+                self.remote.put(key, data)
+            self.remote.put_json(ref_key(entry.symbol, entry.timeframe.value), {
+                "key": key,
+                "digest": digest,
+                "period": entry.period,
+                "rows": entry.rows,
+                "first_bar": entry.first_bar,
+                "last_bar": entry.last_bar,
+                "tz": entry.tz,
+                "cached_at": datetime.fromisoformat(entry.cached_at).timestamp(),
+            })
+            self.remote_counts["pushed"] += 1
         except Exception as e:
-            print(f"Error writing cache: {e}")
+            self.remote_counts["push_errors"] += 1
+            print(f"Error pushing {entry.symbol} to remote cache: {e}")
+    
+    def flush_remote(self) -> None:
+        with self._lock:
+            pending, self._pushes = self._pushes, []
+        for future in pending:
+            future.result()
+    
+    def _fetch_remote(self, symbol: str, timeframe: Timeframe) -> Optional[Tuple[dict, pa.Table]]:
+        try:
+            ref = self.remote.get_json(ref_key(symbol, timeframe.value))
+            if ref is None:
+                return None
+            
+            data = self.remote.get(ref["key"])
+            if data is None or content_digest(data) != ref["digest"]:
+                raise ValueError("blob missing or corrupt")
+            
+            return ref, blob_to_table(data, self.dataset.schema)
+        except Exception as e:
+            self.remote_counts["pull_errors"] += 1
+            print(f"Error pulling {symbol} from remote cache: {e}")
+            return None
+    
+    def pull_remote(self, symbols: List[str], timeframe: Timeframe, period: str) -> List[str]:
+        # Imports what other nodes fetched for the stale or missing symbols:
+        # a remote copy wins when it covers `period` and is newer than ours.
+        # Imported bars keep their original cached_at, so freshness is judged
+        # by when Yahoo was last asked, whoever asked.
+        if not self.remote or not symbols:
+            return []
+        
+        fresh = self.fresh_symbols(symbols, timeframe, period)
+        wanted = [symbol for symbol in symbols if symbol not in fresh]
+        if not wanted:
+            return []
+        
+        local = self.index.get_many(wanted, timeframe)
+        fetched = self._remote_pool.map(lambda symbol: self._fetch_remote(symbol, timeframe), wanted)
+        
+        by_period: Dict[str, list] = defaultdict(list)
+        for symbol, found in zip(wanted, fetched):
+            if found is None:
+                continue
+            ref, table = found
+            entry = local.get(symbol)
+            if not period_covers(ref["period"], period) or table.num_rows != ref["rows"]:
+                continue
+            if entry is not None and datetime.fromisoformat(entry.cached_at).timestamp() >= ref["cached_at"]:
+                continue
+            by_period[ref["period"]].append((symbol, ref, table))
+        
+        pulled = []
+        for stored_period, items in by_period.items():
+            spans = {
+                symbol: (
+                    ref["rows"],
+                    pd.Timestamp(ref["first_bar"]) if ref["first_bar"] else None,
+                    pd.Timestamp(ref["last_bar"]) if ref["last_bar"] else None
+                )
+                for symbol, ref, _ in items
+            }
+            self._write(
+                timeframe, stored_period,
+                pa.concat_tables([table for _, _, table in items]),
+                {symbol: ref["tz"] for symbol, ref, _ in items},
+                spans,
+                cached_at={
+                    symbol: datetime.fromtimestamp(ref["cached_at"]).isoformat() for symbol, ref, _ in items
+                },
+                push=False
+            )
+            pulled.extend(spans)
+        
+        self.remote_counts["pulled"] += len(pulled)
+        return pulled
+    
+    def remote_stats(self) -> dict:
+        if not self.remote:
+            return {}
+        return {"store": repr(self.remote), **self.remote_counts}
+    
+    def merge(
+        self,
+        symbol: str,
+        timeframe: Timeframe,
+        period: str,
+        new_data: pd.DataFrame
+    ) -> Optional[pd.DataFrame]:
+        return self.merge_many(timeframe, period, {symbol: new_data}).get(symbol)
+    
+    def merge_many(
+        self,
+        timeframe: Timeframe,
+        period: str,
+        new_frames: Dict[str, pd.DataFrame]
+    ) -> Dict[str, pd.DataFrame]:
+        with self._lock:
+            entries = self.index.get_many(list(new_frames), timeframe)
+            existing_frames = self._load_history(entries, timeframe)
+            
+            # Keep the longest history already stored, not just what this caller asked for.
+            by_period: Dict[str, Dict[str, pd.DataFrame]] = defaultdict(dict)
+            rebased = []
+            for symbol, new_data in new_frames.items():
+                entry = entries.get(symbol)
+                if not bars_agree(existing_frames.get(symbol), new_data):
+                    # A split or dividend re-adjusted the history; the stored
+                    # bars can't be patched, so the caller has to refetch.
+                    rebased.append(entry)
+                    continue
+                stored_period = entry.period if entry and period_covers(entry.period, period) else period
+                merged = merge_bars(existing_frames.get(symbol), new_data)
+                by_period[stored_period][symbol] = trim_to_period(merged, stored_period)
+            
+            if rebased:
+                self._remove_entries(rebased)
+            for stored_period, merged_frames in by_period.items():
+                self.set_many(timeframe, stored_period, merged_frames)
+        
+        return {
+            symbol: trim_to_period(df, period)
+            for merged_frames in by_period.values()
+            for symbol, df in merged_frames.items()
+        }
+    
+    def _remove_entries(self, entries: List[CacheMetadata]) -> None:
+        with self._lock:
+            by_bucket = defaultdict(list)
+            for entry in entries:
+                by_bucket[(entry.timeframe.value, entry.bucket)].append(entry.symbol)
+            
+            for (timeframe, bucket), bucket_keys in by_bucket.items():
+                self.dataset.replace(timeframe, bucket, bucket_keys)
+            
+            self.index.delete_many([(entry.symbol, entry.timeframe.value) for entry in entries])
+            if self.memory:
+                for entry in entries:
+                    self.memory.discard(self._memory_key(entry)[:-1])
+    
+    def _blocked_for(self, failures: int) -> timedelta:
+        if failures < self.quarantine_after:
+            return self.negative_ttl
+        doublings = min(failures - self.quarantine_after, 16)
+        return min(self.max_quarantine, self.quarantine_ttl * (2 ** doublings))
+    
+    def record_failures(self, symbols: List[str], error: str) -> None:
+        if not symbols:
+            return
+        
+        now = datetime.now()
+        previous = self.index.failure_counts(symbols)
+        failures = []
+        for symbol in symbols:
+            count, first_failed_at = previous.get(symbol, (0, now.timestamp()))
+            failures.append(SymbolFailure(
+                symbol=symbol,
+                failures=count + 1,
+                last_error=error,
+                first_failed_at=datetime.fromtimestamp(first_failed_at).isoformat(),
+                last_failed_at=now.isoformat(),
+                blocked_until=(now + self._blocked_for(count + 1)).isoformat()
+            ))
+        self.index.upsert_failures(failures)
+    
+    def record_successes(self, symbols: List[str]) -> None:
+        if symbols:
+            self.index.delete_failures(symbols)
+    
+    def blocked_symbols(self, symbols: List[str]) -> set:
+        return self.index.blocked_symbols(symbols, datetime.now())
+    
+    def quarantine(self) -> List[SymbolFailure]:
+        return self.index.failures()
+    
+    def failure_stats(self) -> dict:
+        failures = self.index.failures()
+        now = datetime.now().isoformat()
+        return {
+            "tracked": len(failures),
+            "blocked": sum(1 for failure in failures if failure.blocked_until > now),
+            "quarantined": sum(1 for failure in failures if failure.failures >= self.quarantine_after),
+        }
+    
+    def clear_quarantine(self, symbols: Optional[List[str]] = None) -> None:
+        if symbols is None:
+            symbols = [failure.symbol for failure in self.index.failures()]
+        self.index.delete_failures(symbols)
     
     def clear_old_cache(self, days: int = 7) -> None:
         cutoff = datetime.now() - timedelta(days=days)
         
-        for file_path in self.cache_dir.glob("*.parquet"):
-            file_mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
-            if file_mtime < cutoff:
-                file_path.unlink()
+        with self._lock:
+            old_entries = self.index.older_than(cutoff)
+            if old_entries:
+                self._remove_entries(old_entries)
+    
+    def gc(self, max_bytes: int) -> int:
+        with self._lock:
+            excess = self.index.total_bytes() - max_bytes
+            if excess <= 0:
+                return 0
+            
+            victims = self.index.eviction_candidates(excess)
+            self._remove_entries(victims)
+            return len(victims)
     
     def clear_all(self) -> None:
-        for file_path in self.cache_dir.glob("*.parquet"):
-            file_path.unlink()
+        with self._lock:
+            shutil.rmtree(self.dataset.root, ignore_errors=True)
+            self.dataset.root.mkdir(parents=True, exist_ok=True)
+            
+            self.index.clear()
+            
+            if self.memory:
+                self.memory.clear()
+
+
+def _align_tz(df: pd.DataFrame, tz) -> pd.DataFrame:
+    if df.index.tz == tz:
+        return df
+    
+    df = df.copy(deep=False)
+    if tz is None:
+        df.index = df.index.tz_localize(None)
+    elif df.index.tz is None:
+        df.index = df.index.tz_localize(tz)
+    else:
+        df.index = df.index.tz_convert(tz)
+    return df
+
+
+def bars_agree(existing: Optional[pd.DataFrame], new_data: pd.DataFrame, rtol: float = 1e-4) -> bool:
+    if existing is None or existing.empty or new_data.empty:
+        return True
+    
+    new_data = _align_tz(new_data, existing.index.tz)
+    
+    # The last stored bar may have still been forming, so only completed bars are compared.
+    overlap = existing.index[:-1].intersection(new_data.index)
+    if overlap.empty:
+        return True
+    
+    columns = ['open', 'high', 'low', 'close']
+    stored = existing.loc[overlap, columns].to_numpy(dtype=np.float64)
+    fresh = new_data.loc[overlap, columns].to_numpy(dtype=np.float64)
+    return bool(np.allclose(stored, fresh, rtol=rtol, equal_nan=True))
+
+
+def merge_bars(existing: Optional[pd.DataFrame], new_data: pd.DataFrame) -> pd.DataFrame:
+    if existing is None or existing.empty:
+        return new_data
+    if new_data.empty:
+        return existing
+    
+    new_data = _align_tz(new_data, existing.index.tz)
+    
+    # The overlapping tail bar is usually still forming, so the fresh copy wins.
+    merged = pd.concat([existing, new_data])
+    merged = merged[~merged.index.duplicated(keep='last')]
+    return merged.sort_index()
@@ -0,0 +1,282 @@
+import os
+import threading
+import zlib
+from contextlib import contextmanager, nullcontext
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from ..transforms import compact_ohlcv
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writes are still atomic renames
+    fcntl = None
+
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+SCHEMA = pa.schema([
+    ('symbol', pa.string()),
+    ('date', pa.timestamp('ns')),
+    ('open', pa.float64()),
+    ('high', pa.float64()),
+    ('low', pa.float64()),
+    ('close', pa.float64()),
+    ('volume', pa.float64()),
+])
+
+# Opt-in compact layout: float32 prices and integer volume, about half the
+# bytes of SCHEMA in memory and on disk. Reads cast whatever a file holds.
+COMPACT_SCHEMA = pa.schema([
+    ('symbol', pa.string()),
+    ('date', pa.timestamp('ns')),
+    ('open', pa.float32()),
+    ('high', pa.float32()),
+    ('low', pa.float32()),
+    ('close', pa.float32()),
+    ('volume', pa.int64()),
+])
+
+
+def symbol_bucket(symbol: str, num_buckets: int) -> int:
+    return zlib.crc32(symbol.encode()) % num_buckets
+
+
+def _bucket_name(bucket: int) -> str:
+    return f"{bucket:02d}"
+
+
+def checksum(data: bytes) -> str:
+    return f"{zlib.crc32(data):08x}"
+
+
+def _column(values, type_: pa.DataType) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    if pa.types.is_integer(type_):
+        return np.nan_to_num(values, nan=0.0).round().astype(np.int64)
+    return values.astype(type_.to_pandas_dtype(), copy=False)
+
+
+def frames_to_table(
+    frames: Dict[str, pd.DataFrame],
+    schema: pa.Schema = SCHEMA
+) -> Tuple[pa.Table, Dict[str, Optional[str]]]:
+    parts = []
+    timezones = {}
+    
+    for symbol, df in frames.items():
+        dates = df.index
+        timezones[symbol] = str(dates.tz) if dates.tz is not None else None
+        if dates.tz is not None:
+            dates = dates.tz_convert('UTC').tz_localize(None)
+        
+        part = pd.DataFrame({col: _column(df[col].to_numpy(), schema.field(col).type) for col in OHLCV_COLUMNS})
+        part.insert(0, 'date', dates.to_numpy())
+        part.insert(0, 'symbol', symbol)
+        parts.append(part)
+    
+    if not parts:
+        return schema.empty_table(), timezones
+    
+    long_df = pd.concat(parts, ignore_index=True)
+    return pa.Table.from_pandas(long_df, schema=schema, preserve_index=False), timezones
+
+
+def block_to_table(
+    values: np.ndarray,
+    symbols: List[str],
+    dates: pd.DatetimeIndex,
+    schema: pa.Schema = SCHEMA
+) -> pa.Table:
+    # A (symbols, bars, fields) block in OHLCV order, NaN close meaning no bar,
+    # to the long layout in one gather: rows come out grouped by symbol, in
+    # the order of `symbols`, and by date within a symbol.
+    present = ~np.isnan(values[:, :, OHLCV_COLUMNS.index('close')])
+    symbol_idx, bar_idx = np.nonzero(present)
+    rows = values[symbol_idx, bar_idx, :]
+    
+    if dates.tz is not None:
+        dates = dates.tz_convert('UTC').tz_localize(None)
+    
+    columns = [
+        pa.array(symbols, pa.string()).take(pa.array(symbol_idx)),
+        pa.array(dates.as_unit('ns').asi8[bar_idx], pa.timestamp('ns')),
+    ]
+    for i, col in enumerate(OHLCV_COLUMNS):
+        type_ = schema.field(col).type
+        columns.append(pa.array(_column(rows[:, i], type_), type_))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def table_to_frames(
+    table: pa.Table,
+    timezones: Dict[str, Optional[str]],
+    compact: bool = False
+) -> Dict[str, pd.DataFrame]:
+    if table.num_rows == 0:
+        return {}
+    
+    long_df = table.to_pandas()
+    frames = {}
+    
+    for symbol, group in long_df.groupby('symbol', sort=False):
+        df = group.set_index('date')[OHLCV_COLUMNS]
+        df.index.name = 'Date'
+        
+        tz = timezones.get(symbol)
+        if tz is not None:
+            df.index = df.index.tz_localize('UTC').tz_convert(tz)
+        
+        frames[symbol] = compact_ohlcv(df) if compact else df
+    
+    return frames
+
+
+class PartitionedDataset:
+    def __init__(self, root: Path, num_buckets: int = 32, checksums=None, schema: pa.Schema = SCHEMA):
+        self.root = root
+        self.num_buckets = num_buckets
+        self.schema = schema
+        # Anything with get_checksum/set_checksum (the cache index); None skips validation.
+        self.checksums = checksums
+        self.root.mkdir(parents=True, exist_ok=True)
+    
+    def bucket_of(self, symbol: str) -> int:
+        return symbol_bucket(symbol, self.num_buckets)
+    
+    def bucket_path(self, timeframe: str, bucket: int) -> Path:
+        return self.root / f"timeframe={timeframe}" / f"bucket={_bucket_name(bucket)}" / "part-0.parquet"
+    
+    @contextmanager
+    def _locked(self, timeframe: str, bucket: int, shared: bool = False) -> Iterator[None]:
+        # Advisory lock per bucket, shared by every process using this cache
+        # directory: readers never see a file and checksum from different writes,
+        # and concurrent read-modify-write cycles don't lose each other's rows.
+        lock_path = self.bucket_path(timeframe, bucket).with_name(".lock")
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _buckets(self, timeframe: str) -> List[int]:
+        directory = self.root / f"timeframe={timeframe}"
+        if not directory.exists():
+            return []
+        return sorted(int(path.name.split("=", 1)[1]) for path in directory.glob("bucket=*"))
+    
+    def read(
+        self,
+        timeframe: str,
+        symbols: Optional[Iterable[str]] = None,
+        since: Optional[pd.Timestamp] = None
+    ) -> pa.Table:
+        expr = None
+        if symbols is not None:
+            symbols = list(symbols)
+            buckets = sorted({self.bucket_of(s) for s in symbols})
+            expr = ds.field('symbol').isin(symbols)
+        else:
+            buckets = self._buckets(timeframe)
+        if since is not None:
+            since_expr = ds.field('date') >= pa.scalar(pd.Timestamp(since).value, pa.timestamp('ns'))
+            expr = since_expr if expr is None else expr & since_expr
+        
+        tables = []
+        for bucket in buckets:
+            table = self._read_verified(timeframe, bucket, expr)
+            if table is not None:
+                tables.append(table)
+        
+        return pa.concat_tables(tables) if tables else self.schema.empty_table()
+    
+    def _read_verified(self, timeframe: str, bucket: int, expr=None, lock: bool = True) -> Optional[pa.Table]:
+        path = self.bucket_path(timeframe, bucket)
+        if not path.parent.exists():
+            return None
+        
+        with (self._locked(timeframe, bucket, shared=True) if lock else nullcontext()):
+            if not path.exists():
+                return None
+            data = path.read_bytes()
+            expected = self.checksums.get_checksum(timeframe, bucket) if self.checksums else None
+        
+        # Validate the exact bytes that get parsed, so a torn or corrupted
+        # file reads as a miss (and gets refetched) instead of as bad bars.
+        if expected is not None and checksum(data) != expected:
+            print(f"Error reading cache: checksum mismatch in {path}")
+            return None
+        
+        try:
+            return pq.read_table(pa.BufferReader(data), schema=self.schema, filters=expr)
+        except Exception as e:
+            print(f"Error reading cache file {path}: {e}")
+            return None
+    
+    def read_bucket(self, timeframe: str, bucket: int) -> Optional[pa.Table]:
+        return self._read_verified(timeframe, bucket)
+    
+    def write_bucket(self, timeframe: str, bucket: int, table: pa.Table) -> int:
+        with self._locked(timeframe, bucket):
+            return self._write_bucket(timeframe, bucket, table)
+    
+    def _write_bucket(self, timeframe: str, bucket: int, table: pa.Table) -> int:
+        path = self.bucket_path(timeframe, bucket)
+        
+        if table.num_rows == 0:
+            if path.exists():
+                path.unlink()
+            if self.checksums:
+                self.checksums.set_checksum(timeframe, bucket, None)
+            return 0
+        
+        table = table.sort_by([('symbol', 'ascending'), ('date', 'ascending')])
+        sink = pa.BufferOutputStream()
+        pq.write_table(table, sink)
+        data = sink.getvalue().to_pybytes()
+        
+        # Write beside the target and rename over it: readers see either the
+        # old file or the new one, never a partial write.
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        
+        if self.checksums:
+            self.checksums.set_checksum(timeframe, bucket, checksum(data))
+        return len(data)
+    
+    def replace(
+        self,
+        timeframe: str,
+        bucket: int,
+        symbols: List[str],
+        new_rows: Optional[pa.Table] = None
+    ) -> Tuple[int, int]:
+        with self._locked(timeframe, bucket):
+            # An unreadable bucket starts over; its other symbols read as misses
+            # and are refetched.
+            existing = self._read_verified(timeframe, bucket, lock=False)
+            tables = []
+            
+            if existing is not None:
+                replaced = pc.is_in(existing['symbol'], value_set=pa.array(symbols, pa.string()))
+                tables.append(existing.filter(pc.invert(replaced)))
+            
+            if new_rows is not None:
+                tables.append(new_rows)
+            
+            table = pa.concat_tables(tables) if tables else self.schema.empty_table()
+            return table.num_rows, self._write_bucket(timeframe, bucket, table)
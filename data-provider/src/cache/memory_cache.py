@@ -0,0 +1,83 @@
+import threading
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+
+class MemoryCache:
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Tuple[pd.DataFrame, int]]" = OrderedDict()
+        # (symbol, timeframe, period) -> full key, so a newer last bar replaces the old frame
+        self._latest: Dict[Tuple, Tuple] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[pd.DataFrame]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+        
+        return item[0].copy(deep=False)
+    
+    def put(self, key: Tuple[Hashable, ...], df: pd.DataFrame) -> None:
+        nbytes = int(df.memory_usage(index=True, deep=False).sum())
+        if nbytes > self.max_bytes:
+            return
+        
+        with self._lock:
+            previous = self._latest.get(key[:-1])
+            if previous is not None:
+                self._remove(previous)
+            
+            self._entries[key] = (df, nbytes)
+            self._latest[key[:-1]] = key
+            self._bytes += nbytes
+            
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+    
+    def _remove(self, key: Tuple) -> None:
+        item = self._entries.pop(key, None)
+        if item is None:
+            return
+        
+        self._bytes -= item[1]
+        if self._latest.get(key[:-1]) == key:
+            del self._latest[key[:-1]]
+    
+    def discard(self, prefix: Tuple[Hashable, ...]) -> None:
+        with self._lock:
+            key = self._latest.get(prefix)
+            if key is not None:
+                self._remove(key)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+            self._bytes = 0
+    
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
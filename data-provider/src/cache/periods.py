@@ -0,0 +1,47 @@
+import pandas as pd
+from typing import Optional
+
+
+_PERIOD_UNITS = (
+    ("mo", "months"),
+    ("wk", "weeks"),
+    ("d", "days"),
+    ("y", "years"),
+)
+
+
+def period_start(period: str, now: Optional[pd.Timestamp] = None) -> Optional[pd.Timestamp]:
+    now = pd.Timestamp.now() if now is None else now
+    
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1)
+    
+    for suffix, unit in _PERIOD_UNITS:
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            amount = int(period[:-len(suffix)])
+            return (now - pd.DateOffset(**{unit: amount})).normalize()
+    
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def trim_to_period(df: pd.DataFrame, period: str, now: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    start = period_start(period, now)
+    if start is None or df.empty:
+        return df
+    
+    if df.index.tz is not None:
+        start = start.tz_localize(df.index.tz)
+    
+    return df[df.index >= start]
+
+
+def period_covers(stored: str, requested: str, now: Optional[pd.Timestamp] = None) -> bool:
+    now = pd.Timestamp.now() if now is None else now
+    stored_start = period_start(stored, now)
+    requested_start = period_start(requested, now)
+    
+    if stored_start is None:
+        return True
+    return requested_start is not None and stored_start <= requested_start
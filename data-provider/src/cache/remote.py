@@ -0,0 +1,152 @@
+import hashlib
+from abc import ABC, abstractmethod
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import Optional
+
+
+class BlobStore(ABC):
+    # Flat key -> bytes store shared by several machines. Blob keys are
+    # content addressed (written once, never changed); refs are small JSON
+    # documents that point at the latest blob of a symbol/timeframe.
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        pass
+    
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        pass
+    
+    def exists(self, key: str) -> bool:
+        return self.get(key) is not None
+    
+    def get_json(self, key: str) -> Optional[dict]:
+        data = self.get(key)
+        return json.loads(data) if data is not None else None
+    
+    def put_json(self, key: str, value: dict) -> None:
+        self.put(key, json.dumps(value, sort_keys=True).encode())
+
+
+def _check_key(key: str) -> str:
+    parts = key.split("/")
+    if not key or key.startswith("/") or any(part in ("", ".", "..") for part in parts):
+        raise ValueError(f"Invalid blob key: {key!r}")
+    return key
+
+
+class DirectoryBlobStore(BlobStore):
+    # A plain directory, local or on a shared mount (NFS, SMB, a synced folder).
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+    
+    def _path(self, key: str) -> Path:
+        return self.root / _check_key(key)
+    
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+    
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+    
+    def __repr__(self) -> str:
+        return f"DirectoryBlobStore({str(self.root)!r})"
+
+
+class HttpBlobStore(BlobStore):
+    # Anything answering GET/PUT/HEAD on <base_url>/<key>: the bundled
+    # `python -m src.cache.blob_server`, nginx with WebDAV, a bucket proxy...
+    def __init__(self, base_url: str, timeout: float = 10.0, token: Optional[str] = None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.token = token
+    
+    def _request(self, method: str, key: str, data: Optional[bytes] = None) -> urllib.request.Request:
+        request = urllib.request.Request(f"{self.base_url}/{_check_key(key)}", data=data, method=method)
+        if self.token:
+            request.add_header("Authorization", f"Bearer {self.token}")
+        if data is not None:
+            request.add_header("Content-Type", "application/octet-stream")
+        return request
+    
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with urllib.request.urlopen(self._request("GET", key), timeout=self.timeout) as response:
+                return response.read()
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+    
+    def put(self, key: str, data: bytes) -> None:
+        with urllib.request.urlopen(self._request("PUT", key, data), timeout=self.timeout):
+            pass
+    
+    def exists(self, key: str) -> bool:
+        try:
+            with urllib.request.urlopen(self._request("HEAD", key), timeout=self.timeout):
+                return True
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return False
+            raise
+    
+    def __repr__(self) -> str:
+        return f"HttpBlobStore({self.base_url!r})"
+
+
+def open_blob_store(location: str) -> BlobStore:
+    if location.startswith(("http://", "https://")):
+        return HttpBlobStore(location, token=os.getenv("TRADER_ALPHA_REMOTE_CACHE_TOKEN"))
+    return DirectoryBlobStore(location)
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def range_hash(first_bar: Optional[str], last_bar: Optional[str], rows: int) -> str:
+    return hashlib.sha256(f"{first_bar}|{last_bar}|{rows}".encode()).hexdigest()[:16]
+
+
+def blob_key(symbol: str, timeframe: str, bar_range: str, digest: str) -> str:
+    # (symbol, timeframe, bar range) names the history; the digest makes the
+    # key immutable even though a forming last bar changes its values.
+    return f"blobs/{timeframe}/{symbol}/{bar_range}-{digest[:32]}.parquet"
+
+
+def ref_key(symbol: str, timeframe: str) -> str:
+    return f"refs/{timeframe}/{symbol}.json"
+
+
+def table_to_blob(table: pa.Table) -> bytes:
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink)
+    return sink.getvalue().to_pybytes()
+
+
+def blob_to_table(data: bytes, schema: pa.Schema) -> pa.Table:
+    # Nodes may run with different dtypes (compact or not); cast on the way in.
+    table = pq.read_table(pa.BufferReader(data))
+    return table.select(schema.names).cast(schema, safe=False)
@@ -0,0 +1,11 @@
+from .single_flight import SingleFlight, AsyncSingleFlight
+from .rate_limit import TokenBucket, CircuitBreaker, CircuitOpenError, UpstreamGuard
+
+__all__ = [
+    'SingleFlight',
+    'AsyncSingleFlight',
+    'TokenBucket',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'UpstreamGuard'
+]
\ No newline at end of file
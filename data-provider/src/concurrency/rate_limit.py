@@ -0,0 +1,173 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"upstream circuit open, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    def __init__(self, rate: float = 10.0, capacity: float = 500.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        
+        self.acquired = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+    
+    def _reserve(self, tokens: float) -> float:
+        # Tokens are taken up front and the balance may go negative; the caller
+        # then sleeps off its share of the debt outside the lock. Waiters are
+        # served in arrival order, and a request larger than the capacity
+        # (a whole download chunk) still goes through.
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.acquired += 1
+            if wait > 0:
+                self.throttled += 1
+                self.wait_seconds += wait
+            return wait
+    
+    def acquire(self, tokens: float = 1.0) -> float:
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+    
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            available = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            return {
+                "rate": self.rate,
+                "capacity": self.capacity,
+                "available": round(available, 1),
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "wait_seconds": round(self.wait_seconds, 1),
+            }
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        
+        self.opened = 0
+        self.rejected = 0
+    
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(remaining)
+                self.state = self.HALF_OPEN
+            
+            # Half open lets a single probe through; its outcome decides.
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.recovery_timeout)
+                self._probing = True
+    
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+    
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opened += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._probing = False
+    
+    def release_probe(self) -> None:
+        # The call was cancelled before it said anything about the upstream:
+        # free the half-open slot so the next call can probe instead.
+        with self._lock:
+            self._probing = False
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+class UpstreamGuard:
+    def __init__(
+        self,
+        limiter: Optional[TokenBucket] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.limiter = limiter or TokenBucket()
+        self.breaker = breaker or CircuitBreaker()
+    
+    def call(self, func: Callable, *args, cost: float = 1.0, **kwargs) -> Any:
+        self.breaker.before_call()
+        try:
+            self.limiter.acquire(cost)
+            result = func(*args, **kwargs)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # CancelledError, KeyboardInterrupt: not an upstream failure.
+            self.breaker.release_probe()
+            raise
+        self.breaker.record_success()
+        return result
+    
+    async def call_async(self, func: Callable, *args, cost: float = 1.0, **kwargs) -> Any:
+        self.breaker.before_call()
+        try:
+            await self.limiter.acquire_async(cost)
+            result = await func(*args, **kwargs)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.release_probe()
+            raise
+        self.breaker.record_success()
+        return result
+    
+    def stats(self) -> dict:
+        return {"limiter": self.limiter.stats(), "breaker": self.breaker.stats()}
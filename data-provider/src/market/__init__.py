@@ -0,0 +1,3 @@
+from .calendar import MarketCalendar, nyse_holidays, nyse_early_closes
+
+__all__ = ['MarketCalendar', 'nyse_holidays', 'nyse_early_closes']
\ No newline at end of file
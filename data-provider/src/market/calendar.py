@@ -0,0 +1,156 @@
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    first = date(year, month, 1)
+    offset = (weekday - first.weekday()) % 7
+    return first + timedelta(days=offset + 7 * (n - 1))
+
+
+def _last_weekday(year: int, month: int, weekday: int) -> date:
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    # Anonymous Gregorian algorithm
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(day: date) -> date:
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def nyse_holidays(year: int) -> Set[date]:
+    holidays = {
+        _nth_weekday(year, 2, 0, 3),                # Washington's Birthday
+        _easter(year) - timedelta(days=2),          # Good Friday
+        _last_weekday(year, 5, 0),                  # Memorial Day
+        _observed(date(year, 7, 4)),                # Independence Day
+        _nth_weekday(year, 9, 0, 1),                # Labor Day
+        _nth_weekday(year, 11, 3, 4),               # Thanksgiving
+        _observed(date(year, 12, 25)),              # Christmas
+    }
+    
+    # A Saturday New Year's Day is not observed on the Friday before.
+    new_year = date(year, 1, 1)
+    if new_year.weekday() < 5:
+        holidays.add(new_year)
+    elif new_year.weekday() == 6:
+        holidays.add(new_year + timedelta(days=1))
+    
+    if year >= 1998:
+        holidays.add(_nth_weekday(year, 1, 0, 3))   # Martin Luther King Jr. Day
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))  # Juneteenth
+    
+    return holidays
+
+
+def nyse_early_closes(year: int) -> Set[date]:
+    holidays = nyse_holidays(year)
+    candidates = [
+        date(year, 7, 3),
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),
+        date(year, 12, 24),
+    ]
+    return {day for day in candidates if day.weekday() < 5 and day not in holidays}
+
+
+class MarketCalendar:
+    def __init__(
+        self,
+        tz: str = "America/New_York",
+        open_time: time = time(9, 30),
+        close_time: time = time(16, 0),
+        early_close_time: time = time(13, 0),
+        settle: timedelta = timedelta(minutes=30),
+        extra_holidays: Optional[Iterable[date]] = None
+    ):
+        self.tz = ZoneInfo(tz)
+        self.open_time = open_time
+        self.close_time = close_time
+        self.early_close_time = early_close_time
+        # Time after the close until the day's bar stops being revised upstream.
+        self.settle = settle
+        self.extra_holidays = set(extra_holidays or ())
+    
+    @lru_cache(maxsize=64)
+    def holidays(self, year: int) -> Set[date]:
+        return nyse_holidays(year) | {day for day in self.extra_holidays if day.year == year}
+    
+    @lru_cache(maxsize=64)
+    def early_closes(self, year: int) -> Set[date]:
+        return nyse_early_closes(year) - self.holidays(year)
+    
+    def is_session(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self.holidays(day.year)
+    
+    def session_bounds(self, day: date) -> Tuple[datetime, datetime]:
+        close_time = self.early_close_time if day in self.early_closes(day.year) else self.close_time
+        return (
+            datetime.combine(day, self.open_time, tzinfo=self.tz),
+            datetime.combine(day, close_time, tzinfo=self.tz),
+        )
+    
+    def next_session(self, day: date) -> date:
+        day += timedelta(days=1)
+        while not self.is_session(day):
+            day += timedelta(days=1)
+        return day
+    
+    def previous_session(self, day: date) -> date:
+        day -= timedelta(days=1)
+        while not self.is_session(day):
+            day -= timedelta(days=1)
+        return day
+    
+    def expires_at(self, cached_at: datetime, ttl: timedelta) -> datetime:
+        cached_at = cached_at.astimezone(self.tz)
+        day = cached_at.date()
+        
+        if self.is_session(day):
+            session_open, session_close = self.session_bounds(day)
+            settled = session_close + self.settle
+            if session_open <= cached_at < settled:
+                # The bar is still forming: refresh after `ttl`, and once more
+                # when it settles.
+                return min(cached_at + ttl, settled)
+            if cached_at < session_open:
+                return session_open
+        
+        return self.session_bounds(self.next_session(day))[0]
+    
+    def fresh_since(self, now: Optional[datetime], ttl: timedelta) -> datetime:
+        # Earliest fetch time that is still valid at `now`; expires_at is
+        # monotonic in the fetch time, so this is a single cutoff.
+        now = (now or datetime.now(timezone.utc)).astimezone(self.tz)
+        day = now.date()
+        
+        if self.is_session(day):
+            session_open, session_close = self.session_bounds(day)
+            settled = session_close + self.settle
+            if session_open <= now < settled:
+                return max(session_open, now - ttl)
+            if now >= settled:
+                return settled
+        
+        return self.session_bounds(self.previous_session(day))[1] + self.settle
@@ -8,6 +8,7 @@ class Timeframe(Enum):
     DAILY = "1d"
     WEEKLY = "1wk"
     MONTHLY = "1mo"
+    SIX_MONTH = "6mo"
 
 
 class StockDataRequest(BaseModel):
@@ -22,3 +23,37 @@ class CacheMetadata(BaseModel):
     period: str
     cached_at: str
     file_path: str
+    bucket: int = 0
+    rows: int = 0
+    bytes: int = 0
+    first_bar: Optional[str] = None
+    last_bar: Optional[str] = None
+    tz: Optional[str] = None
+
+
+class SymbolFailure(BaseModel):
+    symbol: str
+    failures: int
+    last_error: Optional[str] = None
+    first_failed_at: str
+    last_failed_at: str
+    blocked_until: str
+
+
+class CleaningReport(BaseModel):
+    symbol: str
+    rows: int = 0
+    missing_bars: int = 0
+    incomplete_bars: int = 0
+    non_positive_prices: int = 0
+    negative_volume: int = 0
+    zero_volume_bars: int = 0
+    duplicate_timestamps: int = 0
+    repaired_high_low: int = 0
+    
+    @property
+    def anomalies(self) -> int:
+        return (
+            self.missing_bars + self.incomplete_bars + self.non_positive_prices + self.negative_volume
+            + self.zero_volume_bars + self.duplicate_timestamps + self.repaired_high_low
+        )
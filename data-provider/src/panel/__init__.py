@@ -0,0 +1,3 @@
+from .ohlcv_panel import OHLCVPanel, default_panel_path
+
+__all__ = ['OHLCVPanel', 'default_panel_path']
@@ -0,0 +1,213 @@
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from ..models import Timeframe
+from ..cache.dataset import OHLCV_COLUMNS
+
+
+def default_panel_path(timeframe: Timeframe, cache_dir: Optional[str] = None) -> Path:
+    # The JSON sidecar is the panel's entry point: it names the values file.
+    base = Path(cache_dir) if cache_dir is not None else Path.home() / ".trader-alpha" / "cache"
+    return base / "panels" / f"{timeframe.value}.json"
+
+
+class OHLCVPanel:
+    def __init__(
+        self,
+        values: np.ndarray,
+        symbols: List[str],
+        dates: pd.DatetimeIndex,
+        fields: Optional[List[str]] = None,
+        period: Optional[str] = None
+    ):
+        self.values = values
+        self.symbols = list(symbols)
+        self.dates = dates
+        self.fields = list(fields) if fields is not None else list(OHLCV_COLUMNS)
+        # History the panel was built for ("2y"), so readers can tell whether
+        # it covers the period they need; None when unknown.
+        self.period = period
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+    
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Dict[str, pd.DataFrame],
+        dtype=np.float64,
+        period: Optional[str] = None
+    ) -> 'OHLCVPanel':
+        frames = {symbol: df for symbol, df in frames.items() if df is not None and not df.empty}
+        fields = list(OHLCV_COLUMNS)
+        
+        tz = next((df.index.tz for df in frames.values()), None)
+        indexes = [_align_index(df.index, tz) for df in frames.values()]
+        
+        dates = pd.DatetimeIndex([], tz=tz)
+        for index in indexes:
+            dates = dates.union(index)
+        
+        values = np.full((len(frames), len(dates), len(fields)), np.nan, dtype=dtype)
+        for i, (df, index) in enumerate(zip(frames.values(), indexes)):
+            values[i, dates.get_indexer(index), :] = df[fields].to_numpy(dtype=dtype)
+        
+        return cls(values, list(frames), dates, fields, period)
+    
+    @classmethod
+    def from_cache(
+        cls,
+        cache_manager,
+        timeframe: Timeframe,
+        period: str,
+        symbols: Optional[List[str]] = None,
+        dtype=np.float64
+    ) -> 'OHLCVPanel':
+        long_df = cache_manager.read_table(timeframe, symbols, period).to_pandas()
+        fields = list(OHLCV_COLUMNS)
+        
+        symbol_codes, symbol_names = pd.factorize(long_df['symbol'], sort=True)
+        date_codes, dates = pd.factorize(long_df['date'], sort=True)
+        
+        values = np.full((len(symbol_names), len(dates), len(fields)), np.nan, dtype=dtype)
+        values[symbol_codes, date_codes, :] = long_df[fields].to_numpy(dtype=dtype)
+        
+        dates = pd.DatetimeIndex(dates)
+        timezones = cache_manager.index.timezones(timeframe)
+        if len(timezones) == 1:
+            dates = dates.tz_localize('UTC').tz_convert(timezones.pop())
+        
+        return cls(values, list(symbol_names), dates, fields, period)
+    
+    def save(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        pointer = path.with_suffix('.json')
+        previous = _values_name(pointer)
+        
+        # Every save writes a new values file and then swaps the sidecar,
+        # which names it, in a single rename: readers always pair an index
+        # with its own values, and processes that mapped an older file keep
+        # reading that snapshot.
+        version = f"{time.time_ns():x}-{os.getpid()}"
+        values_name = f"{path.stem}.{version}.npy"
+        meta = {
+            "values": values_name,
+            "shape": list(self.values.shape),
+            "symbols": self.symbols,
+            "fields": self.fields,
+            "dates": self.dates.as_unit('ns').asi8.tolist(),
+            "tz": str(self.dates.tz) if self.dates.tz is not None else None,
+            "period": self.period,
+        }
+        
+        tmp_values = path.with_name(f".{values_name}.tmp")
+        tmp_meta = path.with_name(f".{pointer.name}.{version}.tmp")
+        with open(tmp_values, 'wb') as f:
+            np.save(f, np.ascontiguousarray(self.values))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_values, path.with_name(values_name))
+        with open(tmp_meta, 'w') as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_meta, pointer)
+        
+        # Keep the file just replaced for readers that read the old sidecar
+        # but haven't mapped its values yet; older versions go.
+        for stale in path.parent.glob(f"{path.stem}.*.npy"):
+            if stale.name not in (values_name, previous):
+                stale.unlink(missing_ok=True)
+        return pointer
+    
+    @classmethod
+    def open(cls, path: Path, mmap_mode: Optional[str] = 'r') -> 'OHLCVPanel':
+        path = Path(path)
+        meta = json.loads(path.with_suffix('.json').read_text())
+        # Panels saved before versioned values files keep them at <name>.npy.
+        values = np.load(path.with_name(meta.get("values", f"{path.stem}.npy")), mmap_mode=mmap_mode)
+        if "shape" in meta and list(values.shape) != meta["shape"]:
+            raise ValueError(f"Panel {path} values {values.shape} don't match its index {tuple(meta['shape'])}")
+        
+        dates = pd.DatetimeIndex(np.array(meta["dates"], dtype='datetime64[ns]'))
+        if meta.get("tz"):
+            dates = dates.tz_localize('UTC').tz_convert(meta["tz"])
+        
+        return cls(values, meta["symbols"], dates, meta["fields"], meta.get("period"))
+    
+    @classmethod
+    def build(
+        cls,
+        frames: Dict[str, pd.DataFrame],
+        path: Path,
+        dtype=np.float64,
+        period: Optional[str] = None
+    ) -> 'OHLCVPanel':
+        panel = cls.from_frames(frames, dtype=dtype, period=period)
+        panel.save(path)
+        return cls.open(path)
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
+    
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._positions
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.symbols)
+    
+    def keys(self) -> List[str]:
+        return list(self.symbols)
+    
+    def field(self, name: str) -> np.ndarray:
+        return self.values[:, :, self.fields.index(name)]
+    
+    def frame(self, symbol: str) -> Optional[pd.DataFrame]:
+        position = self._positions.get(symbol)
+        if position is None:
+            return None
+        
+        block = self.values[position]
+        present = ~np.isnan(block[:, self.fields.index('close')])
+        if not present.any():
+            return None
+        
+        first = int(np.argmax(present))
+        last = len(present) - int(np.argmax(present[::-1]))
+        block = block[first:last]
+        
+        df = pd.DataFrame(block, index=self.dates[first:last], columns=self.fields, copy=False)
+        if not present[first:last].all():
+            df = df[present[first:last]]
+        return df
+    
+    def get(self, symbol: str, default=None) -> Optional[pd.DataFrame]:
+        df = self.frame(symbol)
+        return df if df is not None else default
+    
+    def __getitem__(self, symbol: str) -> pd.DataFrame:
+        df = self.frame(symbol)
+        if df is None:
+            raise KeyError(symbol)
+        return df
+
+
+def _values_name(pointer: Path) -> Optional[str]:
+    try:
+        return json.loads(pointer.read_text()).get("values")
+    except (OSError, ValueError):
+        return None
+
+
+def _align_index(index: pd.DatetimeIndex, tz) -> pd.DatetimeIndex:
+    if index.tz == tz:
+        return index
+    if tz is None:
+        return index.tz_localize(None)
+    if index.tz is None:
+        return index.tz_localize(tz)
+    return index.tz_convert(tz)
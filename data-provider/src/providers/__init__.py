@@ -1,4 +1,15 @@
 from .base import BaseDataProvider
 from .yfinance_provider import YFinanceProvider
+from .replay_provider import ReplayDataProvider
+from .async_base import AsyncBaseDataProvider
+from .async_yfinance_provider import AsyncYFinanceProvider
+from .factory import create_provider
 
-__all__ = ['BaseDataProvider', 'YFinanceProvider']
\ No newline at end of file
+__all__ = [
+    'BaseDataProvider',
+    'YFinanceProvider',
+    'ReplayDataProvider',
+    'AsyncBaseDataProvider',
+    'AsyncYFinanceProvider',
+    'create_provider'
+]
\ No newline at end of file
@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+import pandas as pd
+from typing import Dict, List
+from ..models import Timeframe
+from ..transforms import resample_ohlcv
+
+
+class AsyncBaseDataProvider(ABC):
+    @abstractmethod
+    async def get_stock_data(
+        self,
+        symbol: str,
+        timeframe: Timeframe,
+        period: str = "2y"
+    ) -> pd.DataFrame:
+        pass
+    
+    @abstractmethod
+    async def get_multiple_stocks(
+        self,
+        symbols: List[str],
+        timeframe: Timeframe,
+        period: str = "2y"
+    ) -> Dict[str, pd.DataFrame]:
+        pass
+    
+    async def get_stock_timeframes(
+        self,
+        symbol: str,
+        timeframes: List[Timeframe],
+        period: str = "2y"
+    ) -> Dict[Timeframe, pd.DataFrame]:
+        df_daily = await self.get_stock_data(symbol, Timeframe.DAILY, period)
+        return {timeframe: resample_ohlcv(df_daily, timeframe) for timeframe in timeframes}
+    
+    async def get_multiple_timeframes(
+        self,
+        symbols: List[str],
+        timeframes: List[Timeframe],
+        period: str = "2y"
+    ) -> Dict[Timeframe, Dict[str, pd.DataFrame]]:
+        daily_data = await self.get_multiple_stocks(symbols, Timeframe.DAILY, period)
+        return {
+            timeframe: {symbol: resample_ohlcv(df, timeframe) for symbol, df in daily_data.items()}
+            for timeframe in timeframes
+        }
@@ -0,0 +1,123 @@
+import asyncio
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from .async_base import AsyncBaseDataProvider
+from .base import BaseDataProvider
+from .yfinance_provider import YFinanceProvider, create_session
+from ..concurrency import AsyncSingleFlight
+from ..models import Timeframe
+
+
+class AsyncYFinanceProvider(AsyncBaseDataProvider):
+    def __init__(
+        self,
+        use_cache: bool = True,
+        cache_dir: Optional[str] = None,
+        resample_from_daily: bool = True,
+        max_concurrency: int = 8,
+        timeout: Optional[float] = 30.0,
+        session=None,
+        provider: Optional[BaseDataProvider] = None
+    ):
+        # yfinance is blocking, so calls run on a dedicated pool. Every request
+        # goes to Yahoo, so one semaphore is the per-host limit, and the pool
+        # size matches it so idle threads never queue behind the semaphore.
+        # All of them share one pooled HTTP session.
+        session = session or create_session(max_concurrency)
+        self.provider = provider or YFinanceProvider(
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            resample_from_daily=resample_from_daily,
+            session=session
+        )
+        if getattr(self.provider, 'session', False) is None:
+            self.provider.session = session
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._host_limit = asyncio.Semaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="yfinance")
+        self._flights = AsyncSingleFlight()
+    
+    @property
+    def cache_manager(self):
+        return self.provider.cache_manager
+    
+    def _release(self, future: asyncio.Future) -> None:
+        self._host_limit.release()
+        if not future.cancelled():
+            future.exception()  # retrieved, so an abandoned call's error isn't logged as lost
+    
+    async def _run(self, func, *args):
+        await self._host_limit.acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, func, *args)
+        except BaseException:
+            self._host_limit.release()
+            raise
+        
+        # The slot is held until the worker thread is done, not until the
+        # caller stops waiting: a timed out or cancelled call still counts
+        # against max_concurrency while its download runs, and its result is
+        # dropped.
+        future.add_done_callback(self._release)
+        return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+    
+    async def get_stock_data(
+        self,
+        symbol: str,
+        timeframe: Timeframe,
+        period: str = "2y"
+    ) -> pd.DataFrame:
+        df = await self._flights.do(
+            (symbol, timeframe.value, period), self._run, self.provider.get_stock_data, symbol, timeframe, period
+        )
+        return df.copy(deep=False)
+    
+    async def get_multiple_stocks(
+        self,
+        symbols: List[str],
+        timeframe: Timeframe,
+        period: str = "2y"
+    ) -> Dict[str, pd.DataFrame]:
+        tasks = [self.get_stock_data(symbol, timeframe, period) for symbol in symbols]
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        results = {}
+        for symbol, outcome in zip(symbols, outcomes):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, BaseException):
+                print(f"   ❌ {symbol}: {outcome}")
+                continue
+            if not outcome.empty:
+                results[symbol] = outcome
+        
+        return results
+    
+    async def get_stock_timeframes(
+        self,
+        symbol: str,
+        timeframes: List[Timeframe],
+        period: str = "2y"
+    ) -> Dict[Timeframe, pd.DataFrame]:
+        key = (symbol, tuple(tf.value for tf in timeframes), period)
+        frames = await self._flights.do(key, self._run, self.provider.get_stock_timeframes, symbol, timeframes, period)
+        return {tf: df.copy(deep=False) for tf, df in frames.items()}
+    
+    def flight_stats(self) -> dict:
+        threads = self.provider.flight_stats() if hasattr(self.provider, 'flight_stats') else {}
+        return {"async": self._flights.stats(), "threads": threads}
+    
+    def upstream_stats(self) -> dict:
+        return self.provider.upstream_stats() if hasattr(self.provider, 'upstream_stats') else {}
+    
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    async def __aenter__(self) -> 'AsyncYFinanceProvider':
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
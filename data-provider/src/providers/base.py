@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 import pandas as pd
 from typing import Dict, List
 from ..models import Timeframe
+from ..transforms import resample_ohlcv
 
 
 class BaseDataProvider(ABC):
@@ -23,6 +24,27 @@ class BaseDataProvider(ABC):
     ) -> Dict[str, pd.DataFrame]:
         pass
     
+    def get_stock_timeframes(
+        self,
+        symbol: str,
+        timeframes: List[Timeframe],
+        period: str = "2y"
+    ) -> Dict[Timeframe, pd.DataFrame]:
+        df_daily = self.get_stock_data(symbol, Timeframe.DAILY, period)
+        return {timeframe: resample_ohlcv(df_daily, timeframe) for timeframe in timeframes}
+    
+    def get_multiple_timeframes(
+        self,
+        symbols: List[str],
+        timeframes: List[Timeframe],
+        period: str = "2y"
+    ) -> Dict[Timeframe, Dict[str, pd.DataFrame]]:
+        daily_data = self.get_multiple_stocks(symbols, Timeframe.DAILY, period)
+        return {
+            timeframe: {symbol: resample_ohlcv(df, timeframe) for symbol, df in daily_data.items()}
+            for timeframe in timeframes
+        }
+    
     def _validate_dataframe(self, df: pd.DataFrame) -> bool:
         required_columns = ['open', 'high', 'low', 'close', 'volume']
-        return all(col in df.columns for col in required_columns)
\ No newline at end of file
+        return all(col in df.columns for col in required_columns)
@@ -0,0 +1,60 @@
+import random
+import threading
+from typing import List
+
+
+class AdaptiveChunker:
+    def __init__(
+        self,
+        initial_size: int = 200,
+        min_size: int = 10,
+        max_size: int = 500,
+        target_latency: float = 20.0,
+        max_retries: int = 3,
+        backoff_base: float = 2.0,
+        backoff_max: float = 60.0
+    ):
+        self.size = initial_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        
+        self.successes = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+    
+    def split(self, symbols: List[str]) -> List[List[str]]:
+        size = max(self.size, 1)
+        return [symbols[i:i + size] for i in range(0, len(symbols), size)]
+    
+    def record_success(self, chunk_size: int, latency: float) -> None:
+        with self._lock:
+            self.successes += 1
+            
+            # Only grow once a chunk of the current size has proven fast enough.
+            if latency > self.target_latency:
+                self.size = max(self.min_size, int(self.size * 0.75))
+            elif chunk_size >= self.size:
+                self.size = min(self.max_size, int(self.size * 1.25) + 1)
+    
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self.size = max(self.min_size, self.size // 2)
+    
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+    
+    def stats(self) -> dict:
+        with self._lock:
+            attempts = self.successes + self.failures
+            return {
+                "chunk_size": self.size,
+                "successes": self.successes,
+                "failures": self.failures,
+                "error_rate": self.failures / attempts if attempts else 0.0,
+            }
@@ -0,0 +1,39 @@
+import os
+from typing import Optional
+from .base import BaseDataProvider
+from ..cache import open_blob_store
+from .yfinance_provider import YFinanceProvider
+from .replay_provider import ReplayDataProvider
+
+
+def create_provider(
+    name: Optional[str] = None,
+    use_cache: bool = True,
+    cache_dir: Optional[str] = None,
+    compact: Optional[bool] = None
+) -> BaseDataProvider:
+    name = name or os.getenv("TRADER_ALPHA_PROVIDER", "yfinance")
+    if compact is None:
+        compact = os.getenv("TRADER_ALPHA_COMPACT_DTYPES", "0") != "0"
+    
+    if name == "yfinance":
+        # Path or http(s) URL of a cache shared with other machines.
+        remote_cache = os.getenv("TRADER_ALPHA_REMOTE_CACHE")
+        return YFinanceProvider(
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            compact=compact,
+            remote=open_blob_store(remote_cache) if remote_cache else None
+        )
+    
+    if name == "replay":
+        return ReplayDataProvider(
+            fixture_dir=os.getenv("TRADER_ALPHA_REPLAY_DIR"),
+            seed=int(os.getenv("TRADER_ALPHA_REPLAY_SEED", "0")),
+            synthetic=os.getenv("TRADER_ALPHA_REPLAY_SYNTHETIC", "1") != "0",
+            end=os.getenv("TRADER_ALPHA_REPLAY_END"),
+            latency=float(os.getenv("TRADER_ALPHA_REPLAY_LATENCY", "0")),
+            compact=compact
+        )
+    
+    raise ValueError(f"Unknown data provider: {name}")
@@ -0,0 +1,168 @@
+import time
+import zlib
+import numpy as np
+import pandas as pd
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+from .base import BaseDataProvider
+from ..models import Timeframe
+from ..market import MarketCalendar
+from ..cache.periods import trim_to_period
+from ..transforms import compact_ohlcv, resample_ohlcv
+
+
+HISTORY_START = date(2000, 1, 3)
+
+FIXTURE_SUFFIXES = ('.parquet', '.csv')
+
+
+class ReplayDataProvider(BaseDataProvider):
+    def __init__(
+        self,
+        fixture_dir: Optional[str] = None,
+        seed: int = 0,
+        synthetic: bool = True,
+        end: Optional[str] = None,
+        latency: float = 0.0,
+        calendar: Optional[MarketCalendar] = None,
+        compact: bool = False
+    ):
+        self.fixture_dir = Path(fixture_dir) if fixture_dir else None
+        self.seed = seed
+        self.synthetic = synthetic
+        self.latency = latency
+        self.compact = compact
+        self.calendar = calendar or MarketCalendar()
+        self.cache_manager = None
+        
+        last_day = pd.Timestamp(end).date() if end else date.today()
+        if not self.calendar.is_session(last_day):
+            last_day = self.calendar.previous_session(last_day)
+        self.end = last_day
+        self._sessions: Optional[pd.DatetimeIndex] = None
+    
+    @staticmethod
+    def synthetic_symbols(count: int) -> List[str]:
+        return [f"SYN{i:05d}" for i in range(count)]
+    
+    def get_stock_data(
+        self,
+        symbol: str,
+        timeframe: Timeframe,
+        period: str = "2y"
+    ) -> pd.DataFrame:
+        df = self._get_stock_data(symbol, timeframe, period)
+        return compact_ohlcv(df) if self.compact else df
+    
+    def _get_stock_data(self, symbol: str, timeframe: Timeframe, period: str) -> pd.DataFrame:
+        if self.latency:
+            time.sleep(self.latency)
+        
+        if timeframe != Timeframe.DAILY:
+            native = self._load_fixture(symbol, timeframe)
+            if native is not None:
+                return trim_to_period(native, period, self._now())
+        
+        df = self._load_fixture(symbol, Timeframe.DAILY)
+        if df is None:
+            if not self.synthetic:
+                raise Exception(f"Error fetching data for {symbol}: no fixture in {self.fixture_dir}")
+            df = self._random_walk(symbol)
+        
+        df = trim_to_period(df, period, self._now())
+        if timeframe == Timeframe.DAILY:
+            return df
+        return resample_ohlcv(df, timeframe)
+    
+    def get_multiple_stocks(
+        self,
+        symbols: List[str],
+        timeframe: Timeframe,
+        period: str = "2y"
+    ) -> Dict[str, pd.DataFrame]:
+        results = {}
+        for symbol in symbols:
+            try:
+                results[symbol] = self.get_stock_data(symbol, timeframe, period)
+            except Exception as e:
+                print(f"   ❌ {symbol}: {e}")
+        return results
+    
+    def _now(self) -> pd.Timestamp:
+        return pd.Timestamp(self.end) + pd.Timedelta(days=1)
+    
+    def _load_fixture(self, symbol: str, timeframe: Timeframe) -> Optional[pd.DataFrame]:
+        if self.fixture_dir is None:
+            return None
+        
+        # Daily fixtures may also sit at the top level of the directory.
+        directories = [self.fixture_dir / timeframe.value]
+        if timeframe == Timeframe.DAILY:
+            directories.append(self.fixture_dir)
+        
+        for directory in directories:
+            for suffix in FIXTURE_SUFFIXES:
+                path = directory / f"{symbol}{suffix}"
+                if path.exists():
+                    return _read_fixture(path)
+        return None
+    
+    def _session_index(self) -> pd.DatetimeIndex:
+        if self._sessions is None:
+            days = pd.bdate_range(HISTORY_START, self.end)
+            sessions = [day for day in days if self.calendar.is_session(day.date())]
+            self._sessions = pd.DatetimeIndex(sessions, name='Date').tz_localize(self.calendar.tz.key)
+        return self._sessions
+    
+    def _random_walk(self, symbol: str) -> pd.DataFrame:
+        # Seeded per symbol, and always walked from HISTORY_START, so a symbol's
+        # bars don't depend on the period asked for or on the other symbols.
+        rng = np.random.default_rng([self.seed, zlib.crc32(symbol.encode())])
+        dates = self._session_index()
+        n = len(dates)
+        
+        volatility = rng.uniform(0.01, 0.04)
+        drift = rng.normal(0.0003, 0.0005)
+        start_price = rng.uniform(5.0, 500.0)
+        
+        # One row of draws per bar, taken in bar order, so the bars before a
+        # date don't change when `end` moves past it.
+        shocks = rng.standard_normal((n, 5))
+        close = start_price * np.exp(np.cumsum(drift + volatility * shocks[:, 0]))
+        previous_close = np.concatenate(([start_price], close[:-1]))
+        open_ = previous_close * np.exp(volatility / 4 * shocks[:, 1])
+        high = np.maximum(open_, close) * np.exp(np.abs(volatility / 2 * shocks[:, 2]))
+        low = np.minimum(open_, close) * np.exp(-np.abs(volatility / 2 * shocks[:, 3]))
+        volume = np.round(np.exp(13.0 + shocks[:, 4]))
+        
+        return pd.DataFrame(
+            {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume},
+            index=dates
+        )
+
+
+def _read_fixture(path: Path) -> pd.DataFrame:
+    if path.suffix == '.parquet':
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, index_col=0)
+        df.index = pd.to_datetime(df.index, utc=True).tz_convert('America/New_York')
+    
+    df.columns = df.columns.str.lower()
+    df.index.name = 'Date'
+    return df[['open', 'high', 'low', 'close', 'volume']].sort_index()
+
+
+def write_fixtures(
+    frames: Dict[str, pd.DataFrame],
+    fixture_dir: str,
+    timeframe: Timeframe = Timeframe.DAILY
+) -> None:
+    directory = Path(fixture_dir)
+    if timeframe != Timeframe.DAILY:
+        directory = directory / timeframe.value
+    directory.mkdir(parents=True, exist_ok=True)
+    
+    for symbol, df in frames.items():
+        df[['open', 'high', 'low', 'close', 'volume']].to_parquet(directory / f"{symbol}.parquet")
@@ -1,15 +1,100 @@
+import os
+import time
 import yfinance as yf
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
 from .base import BaseDataProvider
-from ..models import Timeframe
-from ..cache import CacheManager
+from .chunking import AdaptiveChunker
+from ..concurrency import SingleFlight, TokenBucket, CircuitBreaker, CircuitOpenError, UpstreamGuard
+from ..models import Timeframe, CleaningReport
+from ..cache import BlobStore, CacheManager
+from ..panel import OHLCVPanel
+from ..transforms import compact_ohlcv, resample_ohlcv
+from ..transforms.cleaning import OHLCV_FIELDS, clean_block, clean_frame, frame_to_block, summarize
+
+
+NATIVE_TIMEFRAMES = {Timeframe.DAILY, Timeframe.WEEKLY, Timeframe.MONTHLY}
+
+# Completed bars refetched behind the last stored one, so a split or dividend
+# that re-adjusted the history shows up as a mismatch instead of a silent seam.
+OVERLAP_BARS = 5
+
+
+class EmptyResponseError(ValueError):
+    pass
+
+
+def overlap_start(stored: pd.DataFrame) -> pd.Timestamp:
+    return stored.index[-min(len(stored), OVERLAP_BARS + 1)]
+
+
+def create_session(pool_size: int = 10):
+    # One pooled HTTP session to share between calls, so connections (and
+    # Yahoo's cookie/crumb) are reused. curl_cffi is what yfinance itself uses
+    # and what Yahoo lets through; plain requests otherwise.
+    try:
+        from curl_cffi import requests as curl_requests
+        return curl_requests.Session(impersonate="chrome")
+    except ImportError:
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+        return session
+
+
+# One limiter and breaker per process: every provider instance, worker thread
+# and async task talks to the same Yahoo endpoints. yf.download makes one
+# request per ticker, so a chunk costs as many tokens as it has symbols. The
+# burst covers a full scanner universe (~1,600 symbols) so a daily scan never
+# waits on the bucket; the rate paces anything beyond that.
+YAHOO_UPSTREAM = UpstreamGuard(
+    TokenBucket(
+        rate=float(os.getenv("TRADER_ALPHA_YF_RATE", "10")),
+        capacity=float(os.getenv("TRADER_ALPHA_YF_BURST", "2000"))
+    ),
+    CircuitBreaker(
+        failure_threshold=int(os.getenv("TRADER_ALPHA_YF_BREAKER_FAILURES", "5")),
+        recovery_timeout=float(os.getenv("TRADER_ALPHA_YF_BREAKER_COOLDOWN", "30"))
+    )
+)
 
 
 class YFinanceProvider(BaseDataProvider):
-    def __init__(self, use_cache: bool = True, cache_dir: Optional[str] = None):
+    def __init__(
+        self,
+        use_cache: bool = True,
+        cache_dir: Optional[str] = None,
+        resample_from_daily: bool = True,
+        session=None,
+        max_chunks_in_flight: int = 2,
+        chunker: Optional[AdaptiveChunker] = None,
+        upstream: Optional[UpstreamGuard] = None,
+        compact: bool = False,
+        remote: Optional[BlobStore] = None
+    ):
         self.use_cache = use_cache
-        self.cache_manager = CacheManager(cache_dir) if use_cache else None
+        self.compact = compact
+        self.cache_manager = CacheManager(cache_dir, compact=compact, remote=remote) if use_cache else None
+        self.resample_from_daily = resample_from_daily
+        self.session = session
+        self.max_chunks_in_flight = max_chunks_in_flight
+        self.chunker = chunker or AdaptiveChunker()
+        self.upstream = upstream or YAHOO_UPSTREAM
+        self._flights = SingleFlight()
+        self._cleaning_reports: Dict[str, CleaningReport] = {}
+    
+    def _derives_from_daily(self, timeframe: Timeframe) -> bool:
+        if timeframe == Timeframe.DAILY:
+            return False
+        return self.resample_from_daily or timeframe not in NATIVE_TIMEFRAMES
+    
+    def source_timeframe(self, timeframe: Timeframe) -> Timeframe:
+        # The timeframe actually downloaded and cached to serve `timeframe`.
+        return Timeframe.DAILY if self._derives_from_daily(timeframe) else timeframe
     
     def get_stock_data(
         self, 
@@ -17,23 +102,50 @@ class YFinanceProvider(BaseDataProvider):
         timeframe: Timeframe, 
         period: str = "2y"
     ) -> pd.DataFrame:
+        # Concurrent callers asking for the same series share one fetch;
+        # each gets its own shallow copy so adding columns stays local.
+        df = self._flights.do(
+            (symbol, timeframe.value, period), self._get_stock_data, symbol, timeframe, period
+        )
+        return compact_ohlcv(df) if self.compact else df.copy(deep=False)
+    
+    def _get_stock_data(
+        self,
+        symbol: str,
+        timeframe: Timeframe,
+        period: str
+    ) -> pd.DataFrame:
+        if self._derives_from_daily(timeframe):
+            return resample_ohlcv(self.get_stock_data(symbol, Timeframe.DAILY, period), timeframe)
+        
+        stored = None
         if self.use_cache and self.cache_manager:
+            self.cache_manager.pull_remote([symbol], timeframe, period)
             cached_data = self.cache_manager.get(symbol, timeframe, period)
             if cached_data is not None:
                 return cached_data
+            stored = self.cache_manager.load(symbol, timeframe, period)
+            
+            if self.cache_manager.blocked_symbols([symbol]):
+                if stored is not None and not stored.empty:
+                    return stored
+                raise Exception(f"Error fetching data for {symbol}: symbol is quarantined after repeated failures")
         
         try:
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(period=period, interval=timeframe.value)
+            if stored is not None and not stored.empty:
+                df = self._fetch_history(symbol, timeframe, period, start=overlap_start(stored))
+                self._record_outcome([symbol], {symbol: df} if not df.empty else {})
+                merged = self.cache_manager.merge(symbol, timeframe, period, df)
+                if merged is not None:
+                    return merged
+                print(f"   {symbol} history was re-adjusted, refetching {period}...")
+            
+            df = self._fetch_history(symbol, timeframe, period)
+            self._record_outcome([symbol], {symbol: df} if not df.empty else {})
             
             if df.empty:
                 raise ValueError(f"No data returned for {symbol}")
             
-            df.columns = df.columns.str.lower()
-            
-            if not self._validate_dataframe(df):
-                raise ValueError(f"Invalid dataframe structure for {symbol}")
-            
             if self.use_cache and self.cache_manager:
                 self.cache_manager.set(symbol, timeframe, period, df)
             
@@ -42,80 +154,274 @@ class YFinanceProvider(BaseDataProvider):
         except Exception as e:
             raise Exception(f"Error fetching data for {symbol}: {str(e)}")
     
+    def _fetch_history(
+        self,
+        symbol: str,
+        timeframe: Timeframe,
+        period: str,
+        start: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        ticker = yf.Ticker(symbol, session=self.session)
+        if start is None:
+            df = self.upstream.call(ticker.history, period=period, interval=timeframe.value)
+        else:
+            df = self.upstream.call(ticker.history, start=start.strftime("%Y-%m-%d"), interval=timeframe.value)
+        
+        if df.empty:
+            return df
+        
+        df.columns = df.columns.str.lower()
+        
+        if not self._validate_dataframe(df):
+            raise ValueError(f"Invalid dataframe structure for {symbol}")
+        
+        cleaned, report = clean_frame(df, symbol)
+        self._record_cleaning({symbol: report})
+        return cleaned if cleaned is not None else df.iloc[:0]
+    
     def get_multiple_stocks(
         self, 
         symbols: List[str], 
         timeframe: Timeframe, 
         period: str = "2y"
     ) -> Dict[str, pd.DataFrame]:
+        if self._derives_from_daily(timeframe):
+            daily_data = self.get_multiple_stocks(symbols, Timeframe.DAILY, period)
+            return {symbol: resample_ohlcv(df, timeframe) for symbol, df in daily_data.items()}
+        
         results = {}
         uncached_symbols = []
+        stale_by_start: Dict[pd.Timestamp, List[str]] = {}
+        
+        if self.use_cache and self.cache_manager:
+            # Whatever another node already fetched is imported before Yahoo is asked.
+            pulled = self.cache_manager.pull_remote(symbols, timeframe, period)
+            if pulled:
+                print(f"   Pulled {len(pulled)} symbols from the shared cache")
+            cached_frames = self.cache_manager.load_many(symbols, timeframe, period)
+            fresh = self.cache_manager.fresh_symbols(list(cached_frames), timeframe, period)
+        else:
+            cached_frames = {}
+            fresh = set()
+        
+        # Delisted or renamed tickers fail on every run; don't ask for them again
+        # until their negative-cache entry or quarantine runs out.
+        blocked = set()
+        if self.use_cache and self.cache_manager:
+            blocked = self.cache_manager.blocked_symbols([symbol for symbol in symbols if symbol not in fresh])
+            if blocked:
+                print(f"   Skipping {len(blocked)} quarantined symbols")
         
         for symbol in symbols:
-            if self.use_cache and self.cache_manager:
-                cached_data = self.cache_manager.get(symbol, timeframe, period)
-                if cached_data is not None:
-                    results[symbol] = cached_data
-                else:
+            stored = cached_frames.get(symbol)
+            if stored is None or stored.empty:
+                if symbol not in blocked:
                     uncached_symbols.append(symbol)
+            elif symbol in fresh or symbol in blocked:
+                results[symbol] = stored
             else:
-                uncached_symbols.append(symbol)
+                stale_by_start.setdefault(overlap_start(stored).normalize(), []).append(symbol)
+        
+        for start, stale_symbols in stale_by_start.items():
+            print(f"   Updating {len(stale_symbols)} cached symbols since {start.date()}...")
+            batch_data = self._download_batch(stale_symbols, timeframe, period, start=start)
+            
+            for symbol in stale_symbols:
+                results[symbol] = batch_data.get(symbol, cached_frames[symbol])
         
         if uncached_symbols:
             print(f"   Downloading {len(uncached_symbols)} symbols in batch...")
             batch_data = self._download_batch(uncached_symbols, timeframe, period)
             results.update(batch_data)
         
-        return results
+        return self._compact_all(results)
     
     def _download_batch(
         self,
         symbols: List[str],
         timeframe: Timeframe,
-        period: str = "2y"
+        period: str = "2y",
+        start: Optional[pd.Timestamp] = None
     ) -> Dict[str, pd.DataFrame]:
         results = {}
+        panels = []
+        attempted = []
         
-        try:
-            symbols_str = " ".join(symbols)
-            data = yf.download(
-                symbols_str,
-                period=period,
-                interval=timeframe.value,
-                group_by='ticker',
-                auto_adjust=True,
-                threads=True,
-                progress=False
-            )
-            
-            if len(symbols) == 1:
-                df = data.copy()
-                df.columns = df.columns.str.lower()
-                if not df.empty and self._validate_dataframe(df):
-                    results[symbols[0]] = df
-                    if self.use_cache and self.cache_manager:
-                        self.cache_manager.set(symbols[0], timeframe, period, df)
-            else:
-                for symbol in symbols:
+        if start is None:
+            range_kwargs = {'period': period}
+        else:
+            range_kwargs = {'start': start.strftime("%Y-%m-%d")}
+        
+        # (ready_at, attempt, chunk, empty_only): empty_only stays True while
+        # every attempt of the chunk came back as an empty response.
+        pending = deque((0.0, 0, chunk, True) for chunk in self.chunker.split(list(symbols)))
+        in_flight = {}
+        
+        with ThreadPoolExecutor(max_workers=self.max_chunks_in_flight) as executor:
+            while pending or in_flight:
+                now = time.monotonic()
+                
+                for _ in range(len(pending)):
+                    if len(in_flight) >= self.max_chunks_in_flight:
+                        break
+                    ready_at, attempt, chunk, empty_only = pending.popleft()
+                    if ready_at > now:
+                        pending.append((ready_at, attempt, chunk, empty_only))
+                        continue
+                    future = executor.submit(self._download_chunk, chunk, timeframe, range_kwargs)
+                    in_flight[future] = (attempt, chunk, empty_only)
+                
+                if not in_flight:
+                    time.sleep(max(0.0, min(item[0] for item in pending) - now))
+                    continue
+                
+                timeout = None
+                if pending:
+                    timeout = max(0.0, min(item[0] for item in pending) - now)
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    attempt, chunk, empty_only = in_flight.pop(future)
                     try:
-                        if symbol in data.columns.levels[0]:
-                            df = data[symbol].copy()
-                            df.columns = df.columns.str.lower()
-                            
-                            if not df.empty and self._validate_dataframe(df):
-                                results[symbol] = df
-                                if self.use_cache and self.cache_manager:
-                                    self.cache_manager.set(symbol, timeframe, period, df)
+                        panel, latency = future.result()
+                    except CircuitOpenError as e:
+                        # Nothing was sent, so the chunk size isn't to blame.
+                        if attempt >= self.chunker.max_retries:
+                            print(f"   ❌ Chunk of {len(chunk)} symbols skipped: {e}")
+                            continue
+                        pending.append((time.monotonic() + e.retry_after, attempt + 1, chunk, empty_only))
+                        continue
                     except Exception as e:
-                        print(f"   ❌ {symbol}: {str(e)}")
+                        self.chunker.record_failure()
+                        empty_only = empty_only and isinstance(e, EmptyResponseError)
+                        if attempt >= self.chunker.max_retries:
+                            print(f"   ❌ Chunk of {len(chunk)} symbols failed after {attempt + 1} attempts: {e}")
+                            # A lone symbol that keeps failing, or a chunk that
+                            # came back empty every time (e.g. all delisted), is
+                            # the symbols' fault: record it so they get
+                            # quarantined. Upstream outages trip the breaker
+                            # instead and aren't recorded.
+                            if len(chunk) == 1 or empty_only:
+                                attempted.extend(chunk)
+                            continue
+                        
+                        delay = self.chunker.backoff(attempt)
+                        print(f"   ⚠️  Chunk of {len(chunk)} symbols failed ({e}), retrying in {delay:.1f}s")
+                        ready_at = time.monotonic() + delay
+                        for retry_chunk in self.chunker.split(chunk):
+                            pending.append((ready_at, attempt + 1, retry_chunk, empty_only))
                         continue
-            
-        except Exception as e:
-            print(f"   ❌ Batch download failed: {e}")
-            print(f"   ⚠️  Skipping individual fallback to avoid rate limiting")
+                    
+                    self.chunker.record_success(len(chunk), latency)
+                    # Frames are views into the chunk's block, not copies.
+                    panels.append(panel)
+                    results.update((symbol, panel.frame(symbol)) for symbol in panel.symbols)
+                    attempted.extend(chunk)
+        
+        self._record_outcome(attempted, results)
+        
+        if results and self.use_cache and self.cache_manager:
+            if start is not None:
+                merged = self.cache_manager.merge_many(timeframe, period, results)
+                # Symbols whose overlap no longer matches were dropped from the cache.
+                rebased = [symbol for symbol in results if symbol not in merged]
+                if rebased:
+                    print(f"   {len(rebased)} symbols were re-adjusted, refetching {period}...")
+                    merged.update(self._download_batch(rebased, timeframe, period))
+                results = merged
+            else:
+                self.cache_manager.set_panels(timeframe, period, panels)
         
         return results
     
+    def _download_raw(
+        self,
+        symbols: List[str],
+        timeframe: Timeframe,
+        range_kwargs: dict
+    ) -> Tuple[pd.DataFrame, float]:
+        started = time.monotonic()
+        
+        data = yf.download(
+            " ".join(symbols),
+            interval=timeframe.value,
+            group_by='ticker',
+            auto_adjust=True,
+            threads=True,
+            progress=False,
+            session=self.session,
+            **range_kwargs
+        )
+        latency = time.monotonic() - started
+        
+        # yfinance reports throttling and outages as an empty frame rather than
+        # an error; raising here also counts it against the circuit breaker.
+        if data is None or data.empty:
+            raise EmptyResponseError("empty response")
+        
+        return data, latency
+    
+    def _download_chunk(
+        self,
+        symbols: List[str],
+        timeframe: Timeframe,
+        range_kwargs: dict
+    ) -> Tuple[OHLCVPanel, float]:
+        data, latency = self.upstream.call(self._download_raw, symbols, timeframe, range_kwargs, cost=len(symbols))
+        
+        # Clean the whole chunk in one pass, then keep it as one symbol-major
+        # block: per-symbol frames are slices of it and it is written as is.
+        values, dates = frame_to_block(data, symbols)
+        values, valid, dates, reports = clean_block(values, dates, symbols)
+        self._record_cleaning(reports)
+        
+        kept = valid.any(axis=0)
+        block = np.ascontiguousarray(values.transpose(1, 0, 2)[kept])
+        block[~valid.T[kept]] = np.nan
+        return OHLCVPanel(block, [symbol for symbol, keep in zip(symbols, kept) if keep], dates, OHLCV_FIELDS), latency
+    
+    def _record_cleaning(self, reports: Dict[str, CleaningReport]) -> None:
+        summary = summarize(reports)
+        if summary:
+            print(f"   🧹 {summary}")
+        
+        for symbol, report in reports.items():
+            if report.anomalies:
+                self._cleaning_reports[symbol] = report
+            else:
+                self._cleaning_reports.pop(symbol, None)
+    
+    def cleaning_reports(self) -> List[CleaningReport]:
+        # Latest report of every symbol whose last download had bad bars.
+        reports = list(self._cleaning_reports.values())
+        return sorted(reports, key=lambda report: report.anomalies, reverse=True)
+    
+    def _compact_all(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        if not self.compact:
+            return frames
+        return {symbol: compact_ohlcv(df) for symbol, df in frames.items()}
+    
+    def _record_outcome(self, attempted: List[str], results: Dict[str, pd.DataFrame]) -> None:
+        if not (self.use_cache and self.cache_manager):
+            return
+        
+        self.cache_manager.record_failures(
+            [symbol for symbol in attempted if symbol not in results], "no data returned"
+        )
+        self.cache_manager.record_successes([symbol for symbol in attempted if symbol in results])
+    
+    def quarantine(self) -> list:
+        return self.cache_manager.quarantine() if self.cache_manager else []
+    
+    def flight_stats(self) -> dict:
+        return self._flights.stats()
+    
+    def upstream_stats(self) -> dict:
+        return self.upstream.stats()
+    
+    def remote_stats(self) -> dict:
+        return self.cache_manager.remote_stats() if self.cache_manager else {}
+    
     def clear_cache(self) -> None:
         if self.cache_manager:
             self.cache_manager.clear_all()
@@ -0,0 +1,5 @@
+from .resample import bar_labels, resample_ohlcv
+from .dtypes import compact_ohlcv
+from .cleaning import clean_block, clean_frame, frame_to_block
+
+__all__ = ['bar_labels', 'resample_ohlcv', 'compact_ohlcv', 'clean_block', 'clean_frame', 'frame_to_block']
\ No newline at end of file
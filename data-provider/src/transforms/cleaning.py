@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from ..models import CleaningReport
+
+
+OHLCV_FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+PRICE_FIELDS = ['open', 'high', 'low', 'close']
+
+
+def frame_to_block(
+    data: pd.DataFrame,
+    symbols: List[str]
+) -> Tuple[np.ndarray, pd.DatetimeIndex]:
+    # yf.download output, (ticker, field) columns or flat fields for a single
+    # ticker, as one (bars, symbols, fields) float64 block in OHLCV order.
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.copy(deep=False)
+        data.columns = pd.MultiIndex.from_arrays([
+            data.columns.get_level_values(0),
+            data.columns.get_level_values(1).str.lower()
+        ])
+        columns = pd.MultiIndex.from_product([symbols, OHLCV_FIELDS])
+    else:
+        data = data.rename(columns=str.lower)
+        columns = OHLCV_FIELDS
+    
+    values = data.reindex(columns=columns).to_numpy(dtype=np.float64)
+    return values.reshape(len(data), len(symbols), len(OHLCV_FIELDS)), data.index
+
+
+def clean_block(
+    values: np.ndarray,
+    dates: pd.DatetimeIndex,
+    symbols: List[str]
+) -> Tuple[np.ndarray, np.ndarray, pd.DatetimeIndex, Dict[str, CleaningReport]]:
+    # One vectorized pass over the whole batch. Returns the block (bad rows
+    # kept, high/low repaired in place), a (bars, symbols) mask of the bars
+    # worth keeping, the matching dates and a report per symbol.
+    reports = {symbol: CleaningReport(symbol=symbol) for symbol in symbols}
+    if values.size == 0:
+        return values, np.zeros(values.shape[:2], dtype=bool), dates, reports
+    
+    open_, high, low, close, volume = (values[:, :, i] for i in range(len(OHLCV_FIELDS)))
+    prices = values[:, :, :len(PRICE_FIELDS)]
+    present = ~np.isnan(values).all(axis=2)
+    
+    # Repeated timestamps: the last copy wins, as when merging cached bars.
+    duplicated = np.zeros(len(dates), dtype=bool)
+    if not dates.is_unique:
+        duplicated = dates.duplicated(keep='last')
+    duplicates = present & duplicated[:, None]
+    
+    incomplete = present & np.isnan(prices).any(axis=2)
+    with np.errstate(invalid='ignore'):
+        non_positive = present & ~incomplete & (prices <= 0).any(axis=2)
+        negative_volume = present & (volume < 0)
+        # A flat bar with no volume is a placeholder (holiday, session not
+        # open yet), not a trade; it would drag every EMA toward the last close.
+        zero_volume = present & (volume == 0) & (high == low) & (open_ == close)
+    
+    valid = present & ~duplicates & ~incomplete & ~non_positive & ~negative_volume & ~zero_volume
+    
+    # Gaps inside a symbol's history, i.e. bars the rest of the batch has.
+    position = np.arange(len(dates))[:, None]
+    first = np.where(present.any(axis=0), present.argmax(axis=0), len(dates))
+    last = len(dates) - 1 - present[::-1].argmax(axis=0)
+    missing = ~present & (position > first) & (position < last) & ~duplicated[:, None]
+    
+    # High and low must bound open and close; bad prints get widened to fit.
+    with np.errstate(invalid='ignore'):
+        bar_high = np.max(prices, axis=2, initial=-np.inf, where=~np.isnan(prices))
+        bar_low = np.min(prices, axis=2, initial=np.inf, where=~np.isnan(prices))
+        repaired = valid & ((high < bar_high) | (low > bar_low))
+    if repaired.any():
+        if not values.flags.writeable:
+            values = values.copy()
+        values[:, :, 1] = np.where(repaired, bar_high, high)
+        values[:, :, 2] = np.where(repaired, bar_low, low)
+    
+    counts = {
+        'rows': valid.sum(axis=0),
+        'missing_bars': missing.sum(axis=0),
+        'incomplete_bars': incomplete.sum(axis=0),
+        'non_positive_prices': non_positive.sum(axis=0),
+        'negative_volume': negative_volume.sum(axis=0),
+        'zero_volume_bars': zero_volume.sum(axis=0),
+        'duplicate_timestamps': duplicates.sum(axis=0),
+        'repaired_high_low': repaired.sum(axis=0),
+    }
+    for name, per_symbol in counts.items():
+        for symbol, count in zip(symbols, per_symbol.tolist()):
+            setattr(reports[symbol], name, count)
+    
+    if not dates.is_monotonic_increasing:
+        order = np.argsort(dates.asi8, kind='stable')
+        values, valid, dates = values[order], valid[order], dates[order]
+    
+    return values, valid, dates, reports
+
+
+def clean_frame(df: pd.DataFrame, symbol: str) -> Tuple[Optional[pd.DataFrame], CleaningReport]:
+    values, dates = frame_to_block(df, [symbol])
+    values, valid, dates, reports = clean_block(values, dates, [symbol])
+    rows = valid[:, 0]
+    if not rows.any():
+        return None, reports[symbol]
+    
+    cleaned = pd.DataFrame(values[rows, 0, :], index=dates[rows], columns=OHLCV_FIELDS)
+    cleaned.index.name = df.index.name
+    return cleaned, reports[symbol]
+
+
+def summarize(reports: Dict[str, CleaningReport]) -> Optional[str]:
+    flagged = [report for report in reports.values() if report.anomalies]
+    if not flagged:
+        return None
+    
+    dropped = sum(
+        report.incomplete_bars + report.non_positive_prices + report.negative_volume
+        + report.zero_volume_bars + report.duplicate_timestamps
+        for report in flagged
+    )
+    repaired = sum(report.repaired_high_low for report in flagged)
+    gaps = sum(report.missing_bars for report in flagged)
+    return f"{len(flagged)} symbols with bad bars ({dropped} dropped, {repaired} repaired, {gaps} gaps)"
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+
+UINT32_MAX = np.iinfo(np.uint32).max
+
+
+def compact_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    # float32 prices keep ~7 significant digits, far more than a quote has.
+    # Volume is a share count: uint32 while it fits, int64 for the rare
+    # series (long bars of heavily traded names) that outgrow it.
+    df = df.copy(deep=False)
+    
+    for col in PRICE_COLUMNS:
+        if col in df.columns and df[col].dtype != np.float32:
+            df[col] = df[col].to_numpy(dtype=np.float32)
+    
+    if 'volume' in df.columns and df['volume'].dtype != np.uint32:
+        volume = df['volume'].fillna(0).to_numpy(dtype=np.float64).round()
+        fits = volume.size == 0 or (volume.min() >= 0 and volume.max() <= UINT32_MAX)
+        df['volume'] = volume.astype(np.uint32 if fits else np.int64)
+    
+    return df
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from typing import Optional
+from ..market import MarketCalendar
+from ..models import Timeframe
+from .dtypes import compact_ohlcv
+
+
+OHLCV_AGGREGATIONS = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum'
+}
+
+DEFAULT_CALENDAR = MarketCalendar()
+
+
+def bar_labels(index: pd.DatetimeIndex, timeframe: Timeframe) -> pd.DatetimeIndex:
+    # Same anchors as yfinance: weeks start on Monday, months on the 1st and
+    # half-years on Jan 1st / Jul 1st, all at midnight in the exchange timezone.
+    tz = index.tz
+    days = (index.tz_localize(None) if tz is not None else index).normalize()
+    
+    if timeframe == Timeframe.DAILY:
+        labels = days
+    elif timeframe == Timeframe.WEEKLY:
+        labels = days - pd.to_timedelta(days.weekday, unit='D')
+    elif timeframe == Timeframe.MONTHLY:
+        labels = days - pd.to_timedelta(days.day - 1, unit='D')
+    elif timeframe == Timeframe.SIX_MONTH:
+        month_index = (days.year.to_numpy() - 1970) * 12 + ((days.month.to_numpy() - 1) // 6) * 6
+        labels = pd.DatetimeIndex(month_index.astype('datetime64[M]').astype('datetime64[ns]'))
+    else:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    
+    if tz is not None:
+        labels = labels.tz_localize(tz)
+    return labels
+
+
+def resample_ohlcv(
+    df: pd.DataFrame,
+    timeframe: Timeframe,
+    drop_partial_first: bool = True,
+    calendar: Optional[MarketCalendar] = None
+) -> pd.DataFrame:
+    if timeframe == Timeframe.DAILY or df.empty:
+        return df
+    
+    labels = bar_labels(df.index, timeframe)
+    aggregations = {col: how for col, how in OHLCV_AGGREGATIONS.items() if col in df.columns}
+    bars = df.groupby(labels, sort=True).agg(aggregations)
+    bars.index.name = df.index.name
+    
+    # A history that starts mid-bucket would yield a first bar with the wrong
+    # open/high/low; yfinance never returns such a bar, so drop it. The
+    # bucket's first session skips holidays (a holiday Monday, Jan 1st).
+    if drop_partial_first and len(bars) > 1:
+        calendar = calendar or DEFAULT_CALENDAR
+        bucket_start = bars.index[0].date()
+        first_session = bucket_start if calendar.is_session(bucket_start) else calendar.next_session(bucket_start)
+        if df.index[0].date() > first_session:
+            bars = bars.iloc[1:]
+    
+    # Summing uint32 volume widens it; keep compact input compact.
+    if 'volume' in df.columns and df['volume'].dtype == np.uint32:
+        bars = compact_ohlcv(bars)
+    
+    return bars
@@ -0,0 +1,3 @@
+from .daemon import WarmupDaemon, read_symbol_files
+
+__all__ = ['WarmupDaemon', 'read_symbol_files']
\ No newline at end of file
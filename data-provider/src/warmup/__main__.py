@@ -0,0 +1,71 @@
+import argparse
+import os
+import signal
+from pathlib import Path
+from ..cache import open_blob_store
+from ..models import Timeframe
+from ..providers import YFinanceProvider
+from .daemon import DEFAULT_SYMBOL_FILES, WarmupDaemon, read_symbol_files
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Keep the market data cache warm")
+    parser.add_argument("--symbols-file", action="append", type=Path,
+                        help="CSV (or glob) with a 'symbol' column; repeatable. "
+                             "Default: scanner/lists/*.csv + api/default_symbols.csv")
+    parser.add_argument("--timeframes", nargs="+", default=["1d"], choices=[tf.value for tf in Timeframe],
+                        help="Timeframes to keep fresh (weekly/monthly resampled from 1d refresh 1d)")
+    parser.add_argument("--period", default="2y", help="History to keep (shorter periods are sliced from it)")
+    parser.add_argument("--interval", type=float, default=900, help="Seconds between refresh cycles")
+    parser.add_argument("--max-concurrency", type=int, default=2, help="Download chunks in flight")
+    parser.add_argument("--batch-size", type=int, default=200, help="Symbols per progress step")
+    parser.add_argument("--cache-dir", help="Cache directory (default ~/.trader-alpha/cache)")
+    parser.add_argument("--status-file", type=Path, help="Status JSON (default <cache>/warmup_status.json)")
+    parser.add_argument("--port", type=int, help="Also serve the status as JSON over HTTP")
+    parser.add_argument("--once", action="store_true", help="Run a single cycle and exit")
+    parser.add_argument("--compact", action="store_true", default=os.getenv("TRADER_ALPHA_COMPACT_DTYPES", "0") != "0",
+                        help="Store float32 prices and integer volume")
+    parser.add_argument("--remote-cache", default=os.getenv("TRADER_ALPHA_REMOTE_CACHE"),
+                        help="Directory or http(s) URL of a cache shared with other machines")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    
+    symbols = read_symbol_files(args.symbols_file or DEFAULT_SYMBOL_FILES)
+    provider = YFinanceProvider(
+        use_cache=True,
+        cache_dir=args.cache_dir,
+        max_chunks_in_flight=args.max_concurrency,
+        compact=args.compact,
+        remote=open_blob_store(args.remote_cache) if args.remote_cache else None
+    )
+    daemon = WarmupDaemon(
+        symbols,
+        provider,
+        timeframes=[Timeframe(tf) for tf in args.timeframes],
+        period=args.period,
+        interval=args.interval,
+        batch_size=args.batch_size,
+        status_path=args.status_file
+    )
+    print(f"Warming {len(symbols)} symbols ({', '.join(args.timeframes)}, {args.period})")
+    
+    if args.port:
+        daemon.serve_status(args.port)
+        print(f"Status on http://0.0.0.0:{args.port}/status")
+    
+    if args.once:
+        daemon.run_cycle()
+        return
+    
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    try:
+        daemon.run_forever()
+    except KeyboardInterrupt:
+        daemon.stop()
+
+
+if __name__ == "__main__":
+    main()
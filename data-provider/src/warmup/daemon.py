@@ -0,0 +1,170 @@
+import csv
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from ..models import Timeframe
+from ..providers import YFinanceProvider
+
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+DEFAULT_SYMBOL_FILES = [
+    REPO_ROOT / "scanner" / "lists" / "*.csv",
+    REPO_ROOT / "api" / "default_symbols.csv",
+]
+
+
+def read_symbol_files(patterns: Iterable[Path]) -> List[str]:
+    symbols = set()
+    for pattern in patterns:
+        pattern = Path(pattern)
+        for path in sorted(pattern.parent.glob(pattern.name)):
+            with open(path) as f:
+                for row in csv.DictReader(f):
+                    symbol = (row.get("symbol") or "").strip().upper()
+                    if symbol:
+                        symbols.add(symbol)
+    return sorted(symbols)
+
+
+class WarmupDaemon:
+    def __init__(
+        self,
+        symbols: List[str],
+        provider: YFinanceProvider,
+        timeframes: Optional[List[Timeframe]] = None,
+        period: str = "2y",
+        interval: float = 900.0,
+        batch_size: int = 200,
+        status_path: Optional[Path] = None
+    ):
+        self.symbols = symbols
+        self.provider = provider
+        self.cache_manager = provider.cache_manager
+        # Resampled timeframes have no cache entries of their own: keeping
+        # their daily source fresh is what keeps them fresh.
+        self.timeframes = list(dict.fromkeys(
+            provider.source_timeframe(timeframe) for timeframe in timeframes or [Timeframe.DAILY]
+        ))
+        self.period = period
+        self.interval = interval
+        self.batch_size = batch_size
+        self.status_path = Path(status_path) if status_path else self.cache_manager.cache_dir / "warmup_status.json"
+        
+        self._stop = threading.Event()
+        self._status_lock = threading.Lock()
+        self._status: Dict = {
+            "state": "starting",
+            "symbols": len(symbols),
+            "timeframes": [tf.value for tf in self.timeframes],
+            "period": period,
+            "cycles": 0,
+        }
+    
+    def status(self) -> Dict:
+        with self._status_lock:
+            return dict(self._status)
+    
+    def _update(self, **fields) -> None:
+        with self._status_lock:
+            self._status.update(fields, updated_at=datetime.now().isoformat())
+            status = dict(self._status)
+        
+        tmp_path = self.status_path.with_name(f".{self.status_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(status, indent=2))
+        os.replace(tmp_path, self.status_path)
+    
+    def lag_seconds(self, timeframe: Timeframe) -> Optional[float]:
+        # Age of the oldest fetch among the tracked symbols; None if some are
+        # missing. Quarantined symbols aren't fetched, so they don't count.
+        entries = self.cache_manager.index.get_many(self.symbols, timeframe)
+        blocked = self.cache_manager.blocked_symbols(self.symbols)
+        if any(symbol not in entries and symbol not in blocked for symbol in self.symbols):
+            return None
+        if not entries:
+            return None
+        oldest = min(datetime.fromisoformat(entry.cached_at) for entry in entries.values())
+        return (datetime.now() - oldest).total_seconds()
+    
+    def run_cycle(self) -> Dict[str, int]:
+        started = time.time()
+        totals = {"stale": 0, "refreshed": 0, "failed": 0}
+        
+        for timeframe in self.timeframes:
+            fresh = self.cache_manager.fresh_symbols(self.symbols, timeframe, self.period)
+            stale = [symbol for symbol in self.symbols if symbol not in fresh]
+            totals["stale"] += len(stale)
+            self._update(state="refreshing", timeframe=timeframe.value, stale=len(stale), refreshed=0, failed=0)
+            
+            refreshed = failed = 0
+            for i in range(0, len(stale), self.batch_size):
+                if self._stop.is_set():
+                    break
+                
+                batch = stale[i:i + self.batch_size]
+                data = self.provider.get_multiple_stocks(batch, timeframe, self.period)
+                refreshed += len(data)
+                failed += len(batch) - len(data)
+                self._update(refreshed=refreshed, failed=failed, progress=(i + len(batch)) / len(stale))
+            
+            totals["refreshed"] += refreshed
+            totals["failed"] += failed
+        
+        lag = {tf.value: self.lag_seconds(tf) for tf in self.timeframes}
+        self._update(
+            state="idle",
+            cycles=self.status()["cycles"] + 1,
+            last_cycle=totals,
+            last_cycle_seconds=round(time.time() - started, 1),
+            last_cycle_finished_at=datetime.now().isoformat(),
+            lag_seconds=lag,
+            chunker=self.provider.chunker.stats(),
+            quarantine=self.cache_manager.failure_stats(),
+            upstream=self.provider.upstream_stats(),
+            remote=self.cache_manager.remote_stats(),
+        )
+        return totals
+    
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            try:
+                totals = self.run_cycle()
+                print(f"Warm-up cycle: {totals['refreshed']}/{totals['stale']} stale symbols refreshed, "
+                      f"{totals['failed']} failed")
+            except Exception as e:
+                print(f"❌ Warm-up cycle failed: {e}")
+                self._update(state="error", error=str(e))
+            
+            next_run = time.time() + self.interval
+            self._update(next_run_at=datetime.fromtimestamp(next_run).isoformat())
+            self._stop.wait(self.interval)
+    
+    def stop(self) -> None:
+        self._stop.set()
+    
+    def serve_status(self, port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+        daemon = self
+        
+        class StatusHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ("/", "/status"):
+                    self.send_error(404)
+                    return
+                body = json.dumps(daemon.status()).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        server = ThreadingHTTPServer((host, port), StatusHandler)
+        threading.Thread(target=server.serve_forever, name="warmup-status", daemon=True).start()
+        return server
@@ -1,14 +1,19 @@
 #!/usr/bin/env python3
+import argparse
 from datetime import date
+from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
 import time
+import numpy as np
 
-from list_fetcher import get_all_symbols, get_symbol_to_lists_mapping
-from stock_analyzer import StockAnalyzer
+from list_fetcher import get_all_symbols, get_symbol_to_lists_mapping, get_symbols_from_path
+from stock_analyzer import StockAnalyzer, build_result
 from supabase_client import SupabaseClient
-from src.providers import YFinanceProvider
+from src.providers import ReplayDataProvider, create_provider
 from src.models import Timeframe
+from src.panel import OHLCVPanel, default_panel_path
+from src.batch import AlignedBars, batch_fibonacci_retracement, calculate_stock_scores
 
 def analyze_single_stock(symbol: str, analyzer: StockAnalyzer, all_data: Dict, symbol_to_lists: Dict) -> Optional[tuple]:
     preloaded = {
@@ -26,80 +31,157 @@ def analyze_single_stock(symbol: str, analyzer: StockAnalyzer, all_data: Dict, s
         return (symbol, result)
     return None
 
+def analyze_batch(symbols: List[str], all_data: Dict, symbol_to_lists: Dict) -> Dict[str, Dict]:
+    # Every symbol at once: the panels' rows, in the same symbol order, go
+    # through the batch indicators instead of one DataFrame per symbol.
+    symbols = [symbol for symbol in symbols if all(symbol in panel for panel in all_data.values())]
+    blocks = {}
+    for timeframe, panel in all_data.items():
+        positions = {symbol: i for i, symbol in enumerate(panel.symbols)}
+        blocks[timeframe] = panel.values[[positions[symbol] for symbol in symbols]]
+    fields = all_data['daily'].fields
+    
+    scores = calculate_stock_scores(
+        symbols, blocks['monthly'], blocks['weekly'], blocks['daily'], fields=fields
+    )
+    daily = AlignedBars(blocks['daily'], fields)
+    fib_results = batch_fibonacci_retracement(daily, lookback=50)
+    prices = daily.last('close')
+    
+    results = {}
+    for row, symbol in enumerate(symbols):
+        score = scores.get(symbol)
+        if score is None:
+            continue
+        result = build_result(score, fib_results[row], prices[row])
+        result['list_names'] = symbol_to_lists.get(symbol, [])
+        results[symbol] = result
+    return results
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Daily stock scanner")
+    parser.add_argument("--provider", choices=["yfinance", "replay"],
+                        help="Data provider (default: $TRADER_ALPHA_PROVIDER or yfinance)")
+    parser.add_argument("--replay-dir", help="Fixture directory for the replay provider")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for synthetic replay bars")
+    parser.add_argument("--symbols-file", help="CSV with a 'symbol' column, scanned instead of lists/")
+    parser.add_argument("--synthetic-symbols", type=int, help="Scan N generated symbols (replay only)")
+    parser.add_argument("--panel-dir", help="Where to write the OHLCV panels")
+    parser.add_argument("--dry-run", action="store_true", help="Don't save results to Supabase")
+    parser.add_argument("--compact", action="store_true",
+                        help="float32 prices and integer volume in cache, memory and panels")
+    parser.add_argument("--per-symbol", action="store_true",
+                        help="Score one DataFrame per symbol in a thread pool instead of in batch")
+    parser.add_argument("--state-dir",
+                        help="Per-symbol indicator state for --per-symbol (default: <cache>/streaming)")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    
     print(f"{'='*60}")
     print(f"  Daily Stock Scanner - {date.today()}")
     print(f"{'='*60}\n")
     
+    replay = args.provider == "replay"
+    if args.synthetic_symbols and not replay:
+        raise SystemExit("--synthetic-symbols needs --provider replay")
+    
     print("1. Fetching symbols from lists...")
-    symbols = get_all_symbols()
-    symbol_to_lists = get_symbol_to_lists_mapping()
+    if args.synthetic_symbols:
+        symbols = ReplayDataProvider.synthetic_symbols(args.synthetic_symbols)
+        symbol_to_lists = {symbol: ["SYNTHETIC"] for symbol in symbols}
+    elif args.symbols_file:
+        symbols = sorted(set(get_symbols_from_path(Path(args.symbols_file))))
+        symbol_to_lists = {symbol: [Path(args.symbols_file).stem] for symbol in symbols}
+    else:
+        symbols = get_all_symbols()
+        symbol_to_lists = get_symbol_to_lists_mapping()
     
     print(f"   Found {len(symbols)} unique symbols\n")
     
     print("2. Downloading market data in batches...")
-    provider = YFinanceProvider(use_cache=False)
-    
+    if replay:
+        provider = ReplayDataProvider(fixture_dir=args.replay_dir, seed=args.seed, compact=args.compact)
+    else:
+        provider = create_provider(args.provider, use_cache=True, compact=args.compact or None)
+    panel_dtype = np.float32 if args.compact else np.float64
+    
+    # Keep replay panels away from the ones the API serves.
+    panel_dir = args.panel_dir
+    if panel_dir is None and replay:
+        panel_dir = str(Path.home() / ".trader-alpha" / "replay")
+    
+    period = "2y"
     start_time = time.time()
     
-    print("   📥 Downloading DAILY data...")
-    daily_data = provider.get_multiple_stocks(symbols, Timeframe.DAILY, period="2y")
+    print("   📥 Downloading DAILY data (weekly/monthly are resampled locally)...")
+    timeframe_data = provider.get_multiple_timeframes(
+        symbols, [Timeframe.DAILY, Timeframe.WEEKLY, Timeframe.MONTHLY], period=period
+    )
+    daily_data = timeframe_data[Timeframe.DAILY]
+    weekly_data = timeframe_data[Timeframe.WEEKLY]
+    monthly_data = timeframe_data[Timeframe.MONTHLY]
     print(f"      ✅ {len(daily_data)}/{len(symbols)} symbols downloaded")
     
-    print("   📥 Downloading WEEKLY data...")
-    weekly_data = provider.get_multiple_stocks(symbols, Timeframe.WEEKLY, period="2y")
-    print(f"      ✅ {len(weekly_data)}/{len(symbols)} symbols downloaded")
-    
-    print("   📥 Downloading MONTHLY data...")
-    monthly_data = provider.get_multiple_stocks(symbols, Timeframe.MONTHLY, period="2y")
-    print(f"      ✅ {len(monthly_data)}/{len(symbols)} symbols downloaded")
-    
     download_time = time.time() - start_time
     print(f"\n   ⏱️  Download completed in {download_time:.1f} seconds\n")
     
     valid_symbols = set(daily_data.keys()) & set(weekly_data.keys()) & set(monthly_data.keys())
-    print(f"3. Analyzing {len(valid_symbols)} stocks with complete data...")
     
+    # Workers read zero-copy slices from memory-mapped panels instead of
+    # holding one DataFrame per symbol and timeframe.
     all_data = {
-        'daily': daily_data,
-        'weekly': weekly_data,
-        'monthly': monthly_data
+        'daily': OHLCVPanel.build(daily_data, default_panel_path(Timeframe.DAILY, panel_dir), dtype=panel_dtype, period=period),
+        'weekly': OHLCVPanel.build(weekly_data, default_panel_path(Timeframe.WEEKLY, panel_dir), dtype=panel_dtype, period=period),
+        'monthly': OHLCVPanel.build(monthly_data, default_panel_path(Timeframe.MONTHLY, panel_dir), dtype=panel_dtype, period=period)
     }
+    del daily_data, weekly_data, monthly_data
+    
+    print(f"3. Analyzing {len(valid_symbols)} stocks with complete data...")
     
-    analyzer = StockAnalyzer(use_cache=False)
     results: Dict[str, Dict] = {}
+    total = len(valid_symbols)
     
     analysis_start = time.time()
     
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = {executor.submit(analyze_single_stock, symbol, analyzer, all_data, symbol_to_lists): symbol 
-                   for symbol in valid_symbols}
-        
-        completed = 0
-        total = len(valid_symbols)
+    if not args.per_symbol:
+        results = analyze_batch(sorted(valid_symbols), all_data, symbol_to_lists)
+    else:
+        # Indicator state persists between scans: each symbol only pushes its new bars.
+        state_dir = args.state_dir or str(Path(panel_dir or Path.home() / ".trader-alpha" / "cache") / "streaming")
+        analyzer = StockAnalyzer(use_cache=False, state_dir=state_dir)
         
-        for future in as_completed(futures):
-            completed += 1
-            result = future.result()
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            futures = {executor.submit(analyze_single_stock, symbol, analyzer, all_data, symbol_to_lists): symbol 
+                       for symbol in valid_symbols}
             
-            if result:
-                symbol, data = result
-                results[symbol] = data
+            completed = 0
             
-            if completed % 25 == 0:
-                print(f"   Progress: {completed}/{total} ({completed*100//total}%)")
+            for future in as_completed(futures):
+                completed += 1
+                result = future.result()
+                
+                if result:
+                    symbol, data = result
+                    results[symbol] = data
+                
+                if completed % 25 == 0:
+                    print(f"   Progress: {completed}/{total} ({completed*100//total}%)")
     
     analysis_time = time.time() - analysis_start
     print(f"\n   ✅ Analysis complete: {len(results)}/{total} successful")
     print(f"   ⏱️  Analysis completed in {analysis_time:.1f} seconds\n")
     
     print("4. Saving to Supabase...")
-    supabase = SupabaseClient()
-    
     save_start = time.time()
     
-    saved = supabase.save_stock_scores_batch(results)
-    print(f"   ✅ Saved {saved}/{len(results)} stocks to database in 1 batch request")
+    if args.dry_run:
+        print("   ⏭️  Dry run, skipping save")
+    else:
+        supabase = SupabaseClient()
+        saved = supabase.save_stock_scores_batch(results)
+        print(f"   ✅ Saved {saved}/{len(results)} stocks to database in 1 batch request")
     
     save_time = time.time() - save_start
     print(f"   ⏱️  Save completed in {save_time:.1f} seconds\n")
@@ -5,8 +5,9 @@ from typing import List, Dict
 LISTS_DIR = Path(__file__).parent.parent / "lists"
 
 def get_symbols_from_csv(csv_filename: str) -> List[str]:
-    csv_path = LISTS_DIR / csv_filename
-    
+    return get_symbols_from_path(LISTS_DIR / csv_filename)
+
+def get_symbols_from_path(csv_path: Path) -> List[str]:
     if not csv_path.exists():
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
     
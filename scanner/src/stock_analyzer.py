@@ -1,13 +1,58 @@
 from src.providers import YFinanceProvider
 from src.models import Timeframe
 from src.scoring import calculate_stock_score
-from src.indicators import calculate_fibonacci_retracement
+from src.context import IndicatorContext
+from src.streaming import load_states, save_states, seed_symbol_states, catch_up_symbol_states, score_symbol_states
+from pathlib import Path
 from typing import Optional, Dict
+import numpy as np
 import pandas as pd
 
+def build_result(score, fib_result, current_price) -> Dict:
+    # The row saved per symbol, shared by StockAnalyzer and the batch scan.
+    try:
+        current_price = float(current_price) if current_price is not None else None
+        if current_price is not None and not np.isfinite(current_price):
+            current_price = None
+    except (TypeError, ValueError):
+        current_price = None
+    
+    return {
+        "total_score": score.score_breakdown.total_score,
+        "passed_filter": score.score_breakdown.passed_filter,
+        "market_bias_score": score.score_breakdown.market_bias_score,
+        "market_bias_timeframe": score.score_breakdown.market_bias_timeframe.value if score.score_breakdown.market_bias_timeframe else None,
+        "fibonacci_score": score.score_breakdown.fibonacci_score,
+        "fibonacci_zone": score.score_breakdown.fibonacci_zone.value if score.score_breakdown.fibonacci_zone else None,
+        "bx_trender_color": score.score_breakdown.bx_trender_color.value if score.score_breakdown.bx_trender_color else None,
+        "swing_high": float(fib_result.swing_high) if fib_result else None,
+        "swing_low": float(fib_result.swing_low) if fib_result else None,
+        "current_price": current_price,
+    }
+
 class StockAnalyzer:
-    def __init__(self, use_cache: bool = False):
+    def __init__(self, use_cache: bool = False, state_dir: Optional[str] = None):
         self.provider = YFinanceProvider(use_cache=use_cache)
+        # With a state dir, BX-Trender and market bias state is kept per
+        # symbol between scans and only new bars are pushed.
+        self.state_dir = Path(state_dir) if state_dir is not None else None
+    
+    def _score_streaming(self, symbol: str, df_monthly: pd.DataFrame, df_weekly: pd.DataFrame, df_daily: pd.DataFrame, context: IndicatorContext):
+        path = self.state_dir / f"{symbol}.json"
+        states = None
+        if path.exists():
+            try:
+                states = load_states(path)
+                catch_up_symbol_states(states, df_monthly, df_weekly)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️  {symbol}: Reseeding indicator state ({e})")
+                states = None
+        
+        if states is None:
+            states = seed_symbol_states(df_monthly, df_weekly)
+        save_states(path, states)
+        
+        return score_symbol_states(symbol, states, df_daily, 50, context)
     
     def analyze(self, symbol: str, preloaded_data: Optional[Dict[str, pd.DataFrame]] = None) -> Optional[Dict]:
         try:
@@ -28,29 +73,17 @@ class StockAnalyzer:
                 print(f"❌ {symbol}: Empty dataframes")
                 return None
             
-            score = calculate_stock_score(symbol, df_monthly, df_weekly, df_daily)
+            # Scoring already computes the daily fib levels; the context hands them back.
+            context = IndicatorContext()
+            if self.state_dir is not None:
+                score = self._score_streaming(symbol, df_monthly, df_weekly, df_daily, context)
+            else:
+                score = calculate_stock_score(symbol, df_monthly, df_weekly, df_daily, context=context)
             
-            fib_result = calculate_fibonacci_retracement(df_daily, lookback=50)
+            fib_result = context.fibonacci_retracement(df_daily, lookback=50)
             
-            try:
-                current_price = float(df_daily['close'].iloc[-1]) if not df_daily.empty else None
-                if current_price is not None and (pd.isna(current_price) or not pd.np.isfinite(current_price)):
-                    current_price = None
-            except:
-                current_price = None
-            
-            result = {
-                "total_score": score.score_breakdown.total_score,
-                "passed_filter": score.score_breakdown.passed_filter,
-                "market_bias_score": score.score_breakdown.market_bias_score,
-                "market_bias_timeframe": score.score_breakdown.market_bias_timeframe.value if score.score_breakdown.market_bias_timeframe else None,
-                "fibonacci_score": score.score_breakdown.fibonacci_score,
-                "fibonacci_zone": score.score_breakdown.fibonacci_zone.value if score.score_breakdown.fibonacci_zone else None,
-                "bx_trender_color": score.score_breakdown.bx_trender_color.value if score.score_breakdown.bx_trender_color else None,
-                "swing_high": float(fib_result.swing_high) if fib_result else None,
-                "swing_low": float(fib_result.swing_low) if fib_result else None,
-                "current_price": current_price,
-            }
+            current_price = df_daily['close'].iloc[-1] if not df_daily.empty else None
+            result = build_result(score, fib_result, current_price)
             
             print(f"✅ {symbol}: Score={result['total_score']}/11, Filter={'PASS' if result['passed_filter'] else 'FAIL'}")
             
@@ -18,6 +18,8 @@ from .indicators import (
 )
 from .filters import passes_macro_uptrend_filter
 from .scoring import score_market_bias, score_fibonacci, calculate_stock_score
+from .batch import calculate_stock_scores
+from .context import IndicatorContext
 
 __all__ = [
     'BXTrenderColor',
@@ -37,5 +39,7 @@ __all__ = [
     'passes_macro_uptrend_filter',
     'score_market_bias',
     'score_fibonacci',
-    'calculate_stock_score'
+    'calculate_stock_score',
+    'calculate_stock_scores',
+    'IndicatorContext'
 ]
\ No newline at end of file
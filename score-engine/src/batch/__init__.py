@@ -0,0 +1,33 @@
+from .indicators import (
+    align_right,
+    ewm_mean,
+    batch_ema,
+    batch_rsi,
+    batch_t3,
+    batch_bx_trender,
+    batch_heikin_ashi
+)
+from .scoring import (
+    AlignedBars,
+    batch_market_bias,
+    batch_check_market_bias,
+    batch_bx_trender_colors,
+    batch_fibonacci_retracement,
+    calculate_stock_scores
+)
+
+__all__ = [
+    'align_right',
+    'ewm_mean',
+    'batch_ema',
+    'batch_rsi',
+    'batch_t3',
+    'batch_bx_trender',
+    'batch_heikin_ashi',
+    'AlignedBars',
+    'batch_market_bias',
+    'batch_check_market_bias',
+    'batch_bx_trender_colors',
+    'batch_fibonacci_retracement',
+    'calculate_stock_scores'
+]
\ No newline at end of file
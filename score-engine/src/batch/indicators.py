@@ -0,0 +1,172 @@
+import numpy as np
+from typing import Optional, Tuple
+
+
+# Batch variants of the indicators: every array is (symbols, bars), one row
+# per symbol on a shared calendar. A row's history must be right-aligned
+# (NaN padding first, then its bars in order, see align_right) so each row is
+# exactly the series the per-symbol functions would see. Results match the
+# pandas versions bit for bit.
+
+
+def align_right(values: np.ndarray, present: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Moves each row's present bars to the end, keeping their order: holes
+    # and short histories become leading NaN padding. Works on (symbols,
+    # bars) and (symbols, bars, fields) blocks; returns the block and the
+    # number of bars of every row.
+    order = np.argsort(present, axis=1, kind='stable')
+    index = order if values.ndim == 2 else order[:, :, None]
+    aligned = np.take_along_axis(values, index, axis=1).astype(np.float64)
+    
+    lengths = present.sum(axis=1)
+    padding = np.arange(values.shape[1])[None, :] < (values.shape[1] - lengths)[:, None]
+    aligned[padding] = np.nan
+    return aligned, lengths
+
+
+def _leading_nan(values: np.ndarray) -> np.ndarray:
+    return np.cumprod(np.isnan(values), axis=1).astype(bool)
+
+
+def ewm_mean(
+    values: np.ndarray,
+    span: Optional[float] = None,
+    alpha: Optional[float] = None,
+    adjust: bool = False,
+    ignore_na: bool = False
+) -> np.ndarray:
+    # Series.ewm(...).mean() for every row at once: a loop over bars with
+    # vector ops over symbols. Same float operations, in the same order, as
+    # pandas' kernel, center of mass included.
+    com = (span - 1) / 2.0 if span is not None else (1.0 - alpha) / alpha
+    alpha = 1. / (1. + com)
+    old_wt_factor = 1. - alpha
+    new_wt = 1. if adjust else alpha
+    
+    bars = np.asarray(values, dtype=np.float64).T
+    output = np.empty_like(bars)
+    if bars.shape[0] == 0:
+        return output.T
+    
+    weighted = bars[0].copy()
+    old_wt = np.ones(bars.shape[1])
+    output[0] = weighted
+    
+    with np.errstate(invalid='ignore'):
+        for i in range(1, bars.shape[0]):
+            cur = bars[i]
+            is_observation = cur == cur
+            started = weighted == weighted
+            
+            decays = started & is_observation if ignore_na else started
+            old_wt = np.where(decays, old_wt * old_wt_factor, old_wt)
+            
+            updates = decays & is_observation
+            combined = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+            weighted = np.where(updates & (weighted != cur), combined, np.where(started, weighted, cur))
+            
+            if adjust:
+                old_wt = np.where(updates, old_wt + new_wt, old_wt)
+            else:
+                old_wt = np.where(updates, 1., old_wt)
+            output[i] = weighted
+    
+    return output.T
+
+
+def batch_ema(values: np.ndarray, period: int) -> np.ndarray:
+    return ewm_mean(values, span=period)
+
+
+def batch_rsi(values: np.ndarray, period: int) -> np.ndarray:
+    delta = np.diff(values, axis=1, prepend=np.nan)
+    with np.errstate(invalid='ignore'):
+        gain = np.where(delta > 0, delta, 0)
+        loss = -np.where(delta < 0, delta, 0)
+    
+    # Series.where turns the first delta into 0; the padding before it must
+    # stay NaN so the averages start where the row's history does.
+    padding = _leading_nan(values)
+    gain[padding] = np.nan
+    loss[padding] = np.nan
+    
+    alpha = 1.0 / period
+    avg_gain = ewm_mean(gain, alpha=alpha)
+    avg_loss = ewm_mean(loss, alpha=alpha)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+def batch_t3(values: np.ndarray, period: int) -> np.ndarray:
+    b = 0.7
+    c1 = -b**3
+    c2 = 3*b**2 + 3*b**3
+    c3 = -6*b**2 - 3*b - 3*b**3
+    c4 = 1 + 3*b + b**3 + 3*b**2
+    
+    xe1 = batch_ema(values, period)
+    xe2 = batch_ema(xe1, period)
+    xe3 = batch_ema(xe2, period)
+    xe4 = batch_ema(xe3, period)
+    xe5 = batch_ema(xe4, period)
+    xe6 = batch_ema(xe5, period)
+    
+    return c1 * xe6 + c2 * xe5 + c3 * xe4 + c4 * xe3
+
+
+def batch_bx_trender(
+    close: np.ndarray,
+    short_l1: int = 5,
+    short_l2: int = 20,
+    short_l3: int = 15,
+    long_l1: int = 20,
+    long_l2: int = 15,
+    use_short: bool = True,
+    apply_t3: bool = False
+) -> np.ndarray:
+    if use_short:
+        ema_diff = batch_ema(close, short_l1) - batch_ema(close, short_l2)
+        xtrender = batch_rsi(ema_diff, short_l3) - 50
+        if apply_t3:
+            return batch_t3(xtrender, 5)
+        return xtrender
+    
+    ema_close = batch_ema(close, long_l1)
+    return batch_rsi(ema_close, long_l2) - 50
+
+
+def batch_heikin_ashi(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    ha_len: int = 20
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    o = batch_ema(open_, ha_len)
+    c = batch_ema(close, ha_len)
+    h = batch_ema(high, ha_len)
+    l = batch_ema(low, ha_len)
+    
+    haclose = (o + h + l + c) / 4
+    xhaopen = (o + c) / 2
+    
+    # haopen is an alpha=0.5 EMA of [xhaopen at the first bar, haclose shifted
+    # by one bar], see heikin_ashi_open; a NaN stops the recursion for good.
+    inputs = np.empty_like(haclose)
+    inputs[:, 0] = np.nan
+    inputs[:, 1:] = haclose[:, :-1]
+    
+    padding = _leading_nan(xhaopen)
+    first = padding.sum(axis=1)
+    rows = np.flatnonzero(first < inputs.shape[1])
+    inputs[rows, first[rows]] = xhaopen[rows, first[rows]]
+    
+    haopen = ewm_mean(inputs, alpha=0.5)
+    broken = np.cumsum(np.isnan(inputs) & ~padding, axis=1) > 0
+    haopen[broken] = np.nan
+    
+    hahigh = np.fmax(np.fmax(h, haopen), haclose)
+    halow = np.fmin(np.fmin(l, haopen), haclose)
+    return haopen, haclose, hahigh, halow
@@ -0,0 +1,165 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+from ..indicators import get_bx_trender_color
+from ..indicators.fibonacci_retracement import calculate_fibonacci_levels, get_fibonacci_zone, pivot_mask
+from ..scoring.fibonacci_scorer import score_fibonacci_result
+from ..types import (
+    BXTrenderColor,
+    FibonacciResult,
+    FibonacciZone,
+    MarketBiasResult,
+    ScoreBreakdown,
+    StockScore,
+    Timeframe
+)
+from .indicators import align_right, batch_bx_trender, batch_ema, batch_heikin_ashi
+
+
+OHLCV_FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class AlignedBars:
+    # A (symbols, bars, fields) block, e.g. OHLCVPanel.values, with each
+    # symbol's bars right-aligned. A bar is present when its close is.
+    def __init__(self, values: np.ndarray, fields: Optional[Sequence[str]] = None):
+        fields = list(fields) if fields is not None else OHLCV_FIELDS
+        present = ~np.isnan(values[:, :, fields.index('close')])
+        self.values, self.lengths = align_right(values, present)
+        self.fields = fields
+        # Latest values come from the input dtype, as df['close'].iloc[-1] would.
+        self.dtype = values.dtype
+    
+    def field(self, name: str) -> np.ndarray:
+        return self.values[:, :, self.fields.index(name)]
+    
+    def last(self, name: str, offset: int = 1) -> np.ndarray:
+        return self.field(name)[:, -offset].astype(self.dtype)
+
+
+def batch_market_bias(bars: AlignedBars, ha_len: int = 20, ha_len2: int = 7):
+    haopen, haclose, hahigh, halow = batch_heikin_ashi(
+        bars.field('open'), bars.field('high'), bars.field('low'), bars.field('close'), ha_len
+    )
+    return batch_ema(hahigh, ha_len2), batch_ema(halow, ha_len2)
+
+
+def batch_check_market_bias(
+    bars: AlignedBars,
+    timeframe: Timeframe,
+    ha_len: int = 20,
+    ha_len2: int = 7
+) -> List[MarketBiasResult]:
+    h2, l2 = batch_market_bias(bars, ha_len, ha_len2)
+    prices = bars.last('close')
+    
+    return [
+        MarketBiasResult(
+            timeframe=timeframe.value,
+            in_range=bool(bias_low <= price <= bias_high),
+            price=float(price),
+            bias_low=float(bias_low),
+            bias_high=float(bias_high)
+        )
+        for price, bias_low, bias_high in zip(prices, l2[:, -1], h2[:, -1])
+    ]
+
+
+def batch_bx_trender_colors(bars: AlignedBars, use_short: bool = True) -> List[BXTrenderColor]:
+    xtrender = batch_bx_trender(bars.field('close'), use_short=use_short)
+    return [get_bx_trender_color(value, prev) for value, prev in zip(xtrender[:, -1], xtrender[:, -2])]
+
+
+def _latest_pivots(values: np.ndarray, lengths: np.ndarray, lookback: int) -> np.ndarray:
+    # Index of each row's last pivot, -1 if none. Bars too close to the
+    # start of a row's own history can't be pivots, padding or not.
+    mask = pivot_mask(values, lookback)
+    columns = np.arange(values.shape[1])[None, :]
+    mask &= columns >= (values.shape[1] - lengths + max(lookback, 0))[:, None]
+    
+    latest = values.shape[1] - 1 - np.argmax(mask[:, ::-1], axis=1)
+    return np.where(mask.any(axis=1), latest, -1)
+
+
+def batch_fibonacci_retracement(bars: AlignedBars, lookback: int = 10) -> List[Optional[FibonacciResult]]:
+    high = bars.field('high')
+    low = bars.field('low')
+    pivot_highs = _latest_pivots(high, bars.lengths, lookback)
+    pivot_lows = _latest_pivots(-low, bars.lengths, lookback)
+    prices = bars.last('close')
+    
+    results = []
+    for row, (high_idx, low_idx) in enumerate(zip(pivot_highs.tolist(), pivot_lows.tolist())):
+        if high_idx < 0 or low_idx < 0 or high_idx < low_idx:
+            results.append(None)
+            continue
+        
+        swing_high = high[row, high_idx].astype(bars.dtype)
+        swing_low = low[row, low_idx].astype(bars.dtype)
+        fib_levels = calculate_fibonacci_levels(swing_high, swing_low)
+        zone = get_fibonacci_zone(prices[row], fib_levels)
+        
+        results.append(FibonacciResult(
+            swing_high=float(swing_high),
+            swing_low=float(swing_low),
+            current_price=float(prices[row]),
+            fib_0618=float(fib_levels['0.618']),
+            fib_0786=float(fib_levels['0.786']),
+            fib_0826=float(fib_levels['0.826']),
+            zone=zone,
+            in_smart_money_zone=zone in [FibonacciZone.GOLDEN_ZONE, FibonacciZone.SMART_MONEY_ZONE]
+        ))
+    return results
+
+
+def calculate_stock_scores(
+    symbols: Sequence[str],
+    monthly: np.ndarray,
+    weekly: np.ndarray,
+    daily: Optional[np.ndarray] = None,
+    fields: Optional[Sequence[str]] = None,
+    ha_len: int = 20,
+    ha_len2: int = 7,
+    fib_lookback: int = 50
+) -> Dict[str, StockScore]:
+    # calculate_stock_score for a whole universe: (symbols, bars, fields)
+    # blocks with the same symbol order, each timeframe on its own calendar.
+    # Symbols the per-symbol version would fail on (fewer than two monthly
+    # bars, no weekly or daily bars) are left out.
+    monthly_bars = AlignedBars(monthly, fields)
+    weekly_bars = AlignedBars(weekly, fields)
+    fib_bars = AlignedBars(daily, fields) if daily is not None else weekly_bars
+    
+    colors = batch_bx_trender_colors(monthly_bars)
+    monthly_bias = batch_check_market_bias(monthly_bars, Timeframe.MONTHLY, ha_len, ha_len2)
+    weekly_bias = batch_check_market_bias(weekly_bars, Timeframe.WEEKLY, ha_len, ha_len2)
+    fibonacci = batch_fibonacci_retracement(fib_bars, fib_lookback)
+    
+    scorable = (monthly_bars.lengths >= 2) & (weekly_bars.lengths >= 1) & (fib_bars.lengths >= 1)
+    
+    scores = {}
+    for row, symbol in enumerate(symbols):
+        if not scorable[row]:
+            continue
+        
+        if monthly_bias[row].in_range:
+            market_bias_score, market_bias_tf = 6, Timeframe.MONTHLY
+        elif weekly_bias[row].in_range:
+            market_bias_score, market_bias_tf = 3, Timeframe.WEEKLY
+        else:
+            market_bias_score, market_bias_tf = 0, None
+        
+        fibonacci_score, fibonacci_zone = score_fibonacci_result(fibonacci[row])
+        
+        scores[symbol] = StockScore(
+            symbol=symbol,
+            score_breakdown=ScoreBreakdown(
+                market_bias_score=market_bias_score,
+                market_bias_timeframe=market_bias_tf,
+                fibonacci_score=fibonacci_score,
+                fibonacci_zone=fibonacci_zone,
+                total_score=market_bias_score + fibonacci_score,
+                passed_filter=colors[row] != BXTrenderColor.DARK_RED,
+                bx_trender_color=colors[row]
+            )
+        )
+    return scores
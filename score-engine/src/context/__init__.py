@@ -0,0 +1,3 @@
+from .indicator_context import IndicatorContext, frame_fingerprint
+
+__all__ = ['IndicatorContext', 'frame_fingerprint']
\ No newline at end of file
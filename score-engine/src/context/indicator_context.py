@@ -0,0 +1,85 @@
+import pandas as pd
+from typing import Callable, Dict, Optional, Tuple
+from ..indicators import calculate_bx_trender, calculate_market_bias, calculate_fibonacci_retracement
+from ..indicators.bx_trender import bx_trender_result
+from ..indicators.market_bias import market_bias_result
+from ..types import BXTrenderResult, FibonacciResult, MarketBiasResult, Timeframe
+
+
+def frame_fingerprint(df: pd.DataFrame) -> Tuple:
+    # Cheap check that a frame wasn't changed in place since it was cached:
+    # shape, last timestamp and last bar (appended or updated bars show up here).
+    if df.empty:
+        return (df.shape,)
+    return (df.shape, int(pd.util.hash_pandas_object(df.iloc[-1:]).iloc[0]))
+
+
+class IndicatorContext:
+    # Per-symbol memo of indicator results, keyed by (indicator, dataframe,
+    # params). Scoring, the scanner and the charts share one context so each
+    # indicator runs once per request or scan. Results are shared, don't
+    # modify them.
+    def __init__(self):
+        # key -> (df, fingerprint, value); holding the frame keeps its id from
+        # being reused while the context lives.
+        self._results: Dict[Tuple, Tuple[pd.DataFrame, Tuple, object]] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def _memo(self, name: str, df: pd.DataFrame, params: Tuple, compute: Callable[[], object]):
+        key = (name, id(df), params)
+        fingerprint = frame_fingerprint(df)
+        entry = self._results.get(key)
+        if entry is not None and entry[0] is df and entry[1] == fingerprint:
+            self.hits += 1
+            return entry[2]
+        
+        self.misses += 1
+        value = compute()
+        self._results[key] = (df, fingerprint, value)
+        return value
+    
+    def bx_trender(
+        self,
+        df: pd.DataFrame,
+        short_l1: int = 5,
+        short_l2: int = 20,
+        short_l3: int = 15,
+        long_l1: int = 20,
+        long_l2: int = 15,
+        use_short: bool = True,
+        apply_t3: bool = False
+    ) -> pd.Series:
+        params = (short_l1, short_l2, short_l3, long_l1, long_l2, use_short, apply_t3)
+        return self._memo('bx_trender', df, params, lambda: calculate_bx_trender(df, *params))
+    
+    def latest_bx_trender(
+        self,
+        df: pd.DataFrame,
+        short_l1: int = 5,
+        short_l2: int = 20,
+        short_l3: int = 15,
+        long_l1: int = 20,
+        long_l2: int = 15,
+        use_short: bool = True
+    ) -> BXTrenderResult:
+        return bx_trender_result(self.bx_trender(df, short_l1, short_l2, short_l3, long_l1, long_l2, use_short))
+    
+    def market_bias(self, df: pd.DataFrame, ha_len: int = 20, ha_len2: int = 7) -> Tuple[pd.Series, pd.Series]:
+        return self._memo('market_bias', df, (ha_len, ha_len2), lambda: calculate_market_bias(df, ha_len, ha_len2))
+    
+    def check_market_bias(
+        self,
+        df: pd.DataFrame,
+        timeframe: Timeframe,
+        ha_len: int = 20,
+        ha_len2: int = 7
+    ) -> MarketBiasResult:
+        h2, l2 = self.market_bias(df, ha_len, ha_len2)
+        return market_bias_result(df, timeframe, h2, l2)
+    
+    def fibonacci_retracement(self, df: pd.DataFrame, lookback: int = 10) -> Optional[FibonacciResult]:
+        return self._memo('fibonacci', df, (lookback,), lambda: calculate_fibonacci_retracement(df, lookback))
+    
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._results), "hits": self.hits, "misses": self.misses}
@@ -1,9 +1,11 @@
 import pandas as pd
-from ..indicators import get_latest_bx_trender
+from typing import Optional
+from ..context import IndicatorContext
 from ..types import BXTrenderColor
 
 
-def passes_macro_uptrend_filter(df_monthly: pd.DataFrame) -> bool:
-    result = get_latest_bx_trender(df_monthly, use_short=True)
+def passes_macro_uptrend_filter(df_monthly: pd.DataFrame, context: Optional[IndicatorContext] = None) -> bool:
+    context = context or IndicatorContext()
+    result = context.latest_bx_trender(df_monthly, use_short=True)
     
     return result.color != BXTrenderColor.DARK_RED
\ No newline at end of file
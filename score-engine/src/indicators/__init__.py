@@ -10,6 +10,8 @@ from .market_bias import (
 from .fibonacci_retracement import (
     find_pivot_high,
     find_pivot_low,
+    find_pivot_highs,
+    find_pivot_lows,
     calculate_fibonacci_levels,
     calculate_fibonacci_retracement
 )
@@ -22,6 +24,8 @@ __all__ = [
     'check_market_bias',
     'find_pivot_high',
     'find_pivot_low',
+    'find_pivot_highs',
+    'find_pivot_lows',
     'calculate_fibonacci_levels',
     'calculate_fibonacci_retracement'
 ]
\ No newline at end of file
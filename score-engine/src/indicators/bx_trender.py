@@ -91,7 +91,10 @@ def get_latest_bx_trender(
     xtrender_series = calculate_bx_trender(
         df, short_l1, short_l2, short_l3, long_l1, long_l2, use_short
     )
-    
+    return bx_trender_result(xtrender_series)
+
+
+def bx_trender_result(xtrender_series: pd.Series) -> BXTrenderResult:
     latest_value = xtrender_series.iloc[-1]
     prev_value = xtrender_series.iloc[-2]
     
@@ -4,46 +4,71 @@ from typing import Tuple, Optional
 from ..types import FibonacciResult, FibonacciZone
 
 
-def find_pivot_high(df: pd.DataFrame, lookback: int = 5) -> Tuple[Optional[int], Optional[float]]:
-    highs = df['high'].values
+def sliding_max(values: np.ndarray, window: int) -> np.ndarray:
+    # van Herk/Gil-Werman along the last axis: out[..., k] is the max of
+    # values[..., k:k + window] for every full window, in O(n) regardless of
+    # the window size. NaN are skipped.
+    n = values.shape[-1]
+    if window < 1 or n < window:
+        return np.empty(values.shape[:-1] + (0,))
     
-    for i in range(len(highs) - lookback - 1, lookback - 1, -1):
-        is_pivot = True
-        current_high = highs[i]
-        
-        for j in range(1, lookback + 1):
-            if i - j < 0 or i + j >= len(highs):
-                is_pivot = False
-                break
-            if highs[i - j] >= current_high or highs[i + j] >= current_high:
-                is_pivot = False
-                break
-        
-        if is_pivot:
-            return i, current_high
+    blocks = -(-n // window)
+    padded = np.full(values.shape[:-1] + (blocks * window,), -np.inf)
+    padded[..., :n] = values
+    padded = padded.reshape(values.shape[:-1] + (blocks, window))
     
-    return None, None
+    prefix = np.fmax.accumulate(padded, axis=-1).reshape(values.shape[:-1] + (-1,))
+    suffix = np.fmax.accumulate(padded[..., ::-1], axis=-1)[..., ::-1].reshape(values.shape[:-1] + (-1,))
+    return np.fmax(suffix[..., :n - window + 1], prefix[..., window - 1:n])
 
 
-def find_pivot_low(df: pd.DataFrame, lookback: int = 5) -> Tuple[Optional[int], Optional[float]]:
-    lows = df['low'].values
+def pivot_mask(values: np.ndarray, lookback: int) -> np.ndarray:
+    # A pivot is strictly above the `lookback` bars on each side (along the
+    # last axis). Neighbours that are NaN never disqualify a bar, as in the
+    # original backwards scan.
+    values = np.asarray(values, dtype=np.float64)
+    n = values.shape[-1]
+    mask = np.zeros(values.shape, dtype=bool)
+    if lookback < 1:
+        mask[...] = True
+        return mask
+    if n < 2 * lookback + 1:
+        return mask
     
-    for i in range(len(lows) - lookback - 1, lookback - 1, -1):
-        is_pivot = True
-        current_low = lows[i]
-        
-        for j in range(1, lookback + 1):
-            if i - j < 0 or i + j >= len(lows):
-                is_pivot = False
-                break
-            if lows[i - j] <= current_low or lows[i + j] <= current_low:
-                is_pivot = False
-                break
-        
-        if is_pivot:
-            return i, current_low
+    window_max = sliding_max(values, lookback)
+    center = values[..., lookback:n - lookback]
+    left = window_max[..., :n - 2 * lookback]
+    right = window_max[..., lookback + 1:]
+    with np.errstate(invalid='ignore'):
+        mask[..., lookback:n - lookback] = ~(left >= center) & ~(right >= center)
+    return mask
+
+
+def find_pivot_highs(df: pd.DataFrame, lookback: int = 5) -> np.ndarray:
+    return np.flatnonzero(pivot_mask(df['high'].values, lookback))
+
+
+def find_pivot_lows(df: pd.DataFrame, lookback: int = 5) -> np.ndarray:
+    # Negation is exact, so lows are the highs of -low.
+    return np.flatnonzero(pivot_mask(-np.asarray(df['low'].values, dtype=np.float64), lookback))
+
+
+def find_pivot_high(df: pd.DataFrame, lookback: int = 5) -> Tuple[Optional[int], Optional[float]]:
+    pivots = find_pivot_highs(df, lookback)
+    if len(pivots) == 0:
+        return None, None
+    
+    i = int(pivots[-1])
+    return i, df['high'].values[i]
+
+
+def find_pivot_low(df: pd.DataFrame, lookback: int = 5) -> Tuple[Optional[int], Optional[float]]:
+    pivots = find_pivot_lows(df, lookback)
+    if len(pivots) == 0:
+        return None, None
     
-    return None, None
+    i = int(pivots[-1])
+    return i, df['low'].values[i]
 
 
 def calculate_fibonacci_levels(swing_high: float, swing_low: float) -> dict:
@@ -3,11 +3,49 @@ import numpy as np
 from typing import Tuple
 from ..types import MarketBiasResult, Timeframe
 
+try:
+    from numba import njit
+except ImportError:  # optional: the pandas ewm path below needs no compiler
+    njit = None
+
 
 def calculate_ema(series: pd.Series, period: int) -> pd.Series:
     return series.ewm(span=period, adjust=False).mean()
 
 
+def _heikin_ashi_open_loop(xhaopen: np.ndarray, haclose: np.ndarray) -> np.ndarray:
+    haopen = np.empty_like(haclose)
+    if len(haopen):
+        haopen[0] = xhaopen[0]
+    for i in range(1, len(haopen)):
+        haopen[i] = (haopen[i-1] + haclose[i-1]) / 2
+    return haopen
+
+
+_heikin_ashi_open_jit = njit(cache=True)(_heikin_ashi_open_loop) if njit else None
+
+
+def heikin_ashi_open(xhaopen: np.ndarray, haclose: np.ndarray) -> np.ndarray:
+    # haopen[i] = (haopen[i-1] + haclose[i-1]) / 2, seeded with xhaopen[0].
+    if _heikin_ashi_open_jit is not None:
+        return _heikin_ashi_open_jit(xhaopen, haclose)
+    
+    n = len(haclose)
+    if n == 0:
+        return np.empty(0)
+    
+    # The same recursion is an EMA with alpha=0.5 over [xhaopen[0], haclose[:-1]].
+    # 0.5*a + 0.5*b rounds exactly like (a + b) / 2, so the result is bit for
+    # bit the loop's. The loop never recovers from a NaN while ewm skips it,
+    # hence the mask.
+    inputs = np.concatenate(([xhaopen[0]], haclose[:-1]))
+    haopen = pd.Series(inputs).ewm(alpha=0.5, adjust=False).mean().to_numpy()
+    broken = np.isnan(inputs).cumsum() > 0
+    if broken.any():
+        haopen = np.where(broken, np.nan, haopen)
+    return haopen
+
+
 def calculate_heikin_ashi(df: pd.DataFrame, ha_len: int = 20) -> pd.DataFrame:
     o = calculate_ema(df['open'], ha_len)
     c = calculate_ema(df['close'], ha_len)
@@ -17,14 +55,14 @@ def calculate_heikin_ashi(df: pd.DataFrame, ha_len: int = 20) -> pd.DataFrame:
     haclose = (o + h + l + c) / 4
     
     xhaopen = (o + c) / 2
-    haopen = pd.Series(index=df.index, dtype=float)
-    haopen.iloc[0] = xhaopen.iloc[0]
-    
-    for i in range(1, len(df)):
-        haopen.iloc[i] = (haopen.iloc[i-1] + haclose.iloc[i-1]) / 2
+    haopen = pd.Series(
+        heikin_ashi_open(xhaopen.to_numpy(dtype=np.float64), haclose.to_numpy(dtype=np.float64)),
+        index=df.index
+    )
     
-    hahigh = pd.concat([h, haopen, haclose], axis=1).max(axis=1)
-    halow = pd.concat([l, haopen, haclose], axis=1).min(axis=1)
+    # fmax/fmin skip NaN like DataFrame.max/min did.
+    hahigh = pd.Series(np.fmax(np.fmax(h.to_numpy(), haopen.to_numpy()), haclose.to_numpy()), index=df.index)
+    halow = pd.Series(np.fmin(np.fmin(l.to_numpy(), haopen.to_numpy()), haclose.to_numpy()), index=df.index)
     
     return pd.DataFrame({
         'open': haopen,
@@ -56,7 +94,10 @@ def check_market_bias(
     ha_len2: int = 7
 ) -> MarketBiasResult:
     h2, l2 = calculate_market_bias(df, ha_len, ha_len2)
-    
+    return market_bias_result(df, timeframe, h2, l2)
+
+
+def market_bias_result(df: pd.DataFrame, timeframe: Timeframe, h2: pd.Series, l2: pd.Series) -> MarketBiasResult:
     current_price = df['close'].iloc[-1]
     bias_high = h2.iloc[-1]
     bias_low = l2.iloc[-1]
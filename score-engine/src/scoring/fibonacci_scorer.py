@@ -1,21 +1,27 @@
 import pandas as pd
 from typing import Tuple, Optional
-from ..indicators import calculate_fibonacci_retracement
+from ..context import IndicatorContext
 from ..types import FibonacciZone, FibonacciResult
 
 
 def score_fibonacci(
     df: pd.DataFrame,
-    lookback: int = 10
+    lookback: int = 10,
+    context: Optional[IndicatorContext] = None
 ) -> Tuple[int, Optional[FibonacciZone], Optional[FibonacciResult]]:
-    fib_result = calculate_fibonacci_retracement(df, lookback)
-    
+    context = context or IndicatorContext()
+    fib_result = context.fibonacci_retracement(df, lookback)
+    score, zone = score_fibonacci_result(fib_result)
+    return score, zone, fib_result
+
+
+def score_fibonacci_result(fib_result: Optional[FibonacciResult]) -> Tuple[int, Optional[FibonacciZone]]:
     if fib_result is None:
-        return 0, None, None
+        return 0, None
     
     if fib_result.zone == FibonacciZone.GOLDEN_ZONE:
-        return 5, FibonacciZone.GOLDEN_ZONE, fib_result
+        return 5, FibonacciZone.GOLDEN_ZONE
     elif fib_result.zone == FibonacciZone.SMART_MONEY_ZONE:
-        return 3, FibonacciZone.SMART_MONEY_ZONE, fib_result
+        return 3, FibonacciZone.SMART_MONEY_ZONE
     else:
-        return 0, FibonacciZone.OUTSIDE, fib_result
\ No newline at end of file
+        return 0, FibonacciZone.OUTSIDE
\ No newline at end of file
@@ -1,6 +1,6 @@
 import pandas as pd
 from typing import Tuple, Optional
-from ..indicators import check_market_bias
+from ..context import IndicatorContext
 from ..types import Timeframe
 
 
@@ -8,14 +8,16 @@ def score_market_bias(
     df_weekly: pd.DataFrame,
     df_monthly: pd.DataFrame,
     ha_len: int = 20,
-    ha_len2: int = 7
+    ha_len2: int = 7,
+    context: Optional[IndicatorContext] = None
 ) -> Tuple[int, Optional[Timeframe]]:
-    monthly_result = check_market_bias(df_monthly, Timeframe.MONTHLY, ha_len, ha_len2)
+    context = context or IndicatorContext()
+    monthly_result = context.check_market_bias(df_monthly, Timeframe.MONTHLY, ha_len, ha_len2)
     
     if monthly_result.in_range:
         return 6, Timeframe.MONTHLY
     
-    weekly_result = check_market_bias(df_weekly, Timeframe.WEEKLY, ha_len, ha_len2)
+    weekly_result = context.check_market_bias(df_weekly, Timeframe.WEEKLY, ha_len, ha_len2)
     
     if weekly_result.in_range:
         return 3, Timeframe.WEEKLY
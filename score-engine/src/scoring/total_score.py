@@ -1,6 +1,7 @@
 import pandas as pd
+from typing import Optional
+from ..context import IndicatorContext
 from ..filters import passes_macro_uptrend_filter
-from ..indicators import get_latest_bx_trender
 from ..types import StockScore, ScoreBreakdown
 from .market_bias_scorer import score_market_bias
 from .fibonacci_scorer import score_fibonacci
@@ -13,22 +14,25 @@ def calculate_stock_score(
     df_daily: pd.DataFrame = None,
     ha_len: int = 20,
     ha_len2: int = 7,
-    fib_lookback: int = 50
+    fib_lookback: int = 50,
+    context: Optional[IndicatorContext] = None
 ) -> StockScore:
-    passed_filter = passes_macro_uptrend_filter(df_monthly)
+    # Pass a context to reuse the indicators afterwards (charts, fib levels).
+    context = context or IndicatorContext()
+    passed_filter = passes_macro_uptrend_filter(df_monthly, context)
     
     market_bias_score, market_bias_tf = score_market_bias(
-        df_weekly, df_monthly, ha_len, ha_len2
+        df_weekly, df_monthly, ha_len, ha_len2, context
     )
     
     fib_df = df_daily if df_daily is not None else df_weekly
     fibonacci_score, fibonacci_zone, _ = score_fibonacci(
-        fib_df, fib_lookback
+        fib_df, fib_lookback, context
     )
     
     total_score = market_bias_score + fibonacci_score
     
-    bx_result = get_latest_bx_trender(df_monthly, use_short=True)
+    bx_result = context.latest_bx_trender(df_monthly, use_short=True)
     
     return StockScore(
         symbol=symbol,
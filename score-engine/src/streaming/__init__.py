@@ -0,0 +1,26 @@
+from .states import (
+    StreamingState,
+    EWMState,
+    EMAState,
+    RSIState,
+    T3State,
+    BXTrenderState,
+    MarketBiasState
+)
+from .store import save_states, load_states
+from .symbol_states import seed_symbol_states, catch_up_symbol_states, score_symbol_states
+
+__all__ = [
+    'StreamingState',
+    'EWMState',
+    'EMAState',
+    'RSIState',
+    'T3State',
+    'BXTrenderState',
+    'MarketBiasState',
+    'save_states',
+    'load_states',
+    'seed_symbol_states',
+    'catch_up_symbol_states',
+    'score_symbol_states'
+]
\ No newline at end of file
@@ -0,0 +1,452 @@
+import numpy as np
+from abc import ABC, abstractmethod
+import pandas as pd
+from typing import Dict, Optional, Tuple
+from ..indicators import get_bx_trender_color
+from ..indicators.market_bias import heikin_ashi_open
+from ..types import BXTrenderResult, BXTrenderColor, MarketBiasResult, Timeframe
+
+
+# Indicator state that is seeded once from history and then advanced one bar
+# at a time in O(1). Every update does the same float operations as the
+# pandas functions, so streamed values equal the batch ones bit for bit.
+
+_STATE_TYPES: Dict[str, type] = {}
+
+
+def _fmax(a: float, b: float) -> float:
+    # np.fmax on scalars: a NaN loses against a number.
+    if a != a:
+        return b
+    if b != b:
+        return a
+    return max(a, b)
+
+
+def _fmin(a: float, b: float) -> float:
+    if a != a:
+        return b
+    if b != b:
+        return a
+    return min(a, b)
+
+
+class StreamingState(ABC):
+    # Scalars in `_fields` and sub-states in `_children` make up the state
+    # that is saved, and restored by replace_last.
+    _fields: Tuple[str, ...] = ()
+    _children: Tuple[str, ...] = ()
+    # DataFrame columns a bar is made of, for from_history and catch_up.
+    _columns: Tuple[str, ...] = ("close",)
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _STATE_TYPES[cls.__name__] = cls
+    
+    def __init__(self):
+        self.last_time: Optional[str] = None
+        self._previous: Optional[dict] = None
+        # Inputs of the last bar and of the completed bar before it (the
+        # anchor): catch_up checks the anchor to notice rewritten history.
+        self.last_values: Optional[list] = None
+        self.anchor_time: Optional[str] = None
+        self.anchor_values: Optional[list] = None
+        # First bar of the seeding history: recursive indicators depend on
+        # where the window starts, so catch_up also checks it hasn't moved.
+        self.first_time: Optional[str] = None
+        self.first_values: Optional[list] = None
+    
+    def params(self) -> dict:
+        return {}
+    
+    def _state(self) -> dict:
+        state = {name: getattr(self, name) for name in self._fields}
+        state.update({name: getattr(self, name)._state() for name in self._children})
+        return state
+    
+    def _restore(self, state: dict) -> None:
+        for name in self._fields:
+            setattr(self, name, state[name])
+        for name in self._children:
+            getattr(self, name)._restore(state[name])
+    
+    @abstractmethod
+    def _step(self, *values):
+        pass
+    
+    def update(self, *values, time=None):
+        self._previous = self._state()
+        result = self._step(*values)
+        if time is not None:
+            if self.last_time is not None:
+                self.anchor_time, self.anchor_values = self.last_time, self.last_values
+            self.last_time = pd.Timestamp(time).isoformat()
+        self.last_values = [float(value) for value in values]
+        return result
+    
+    def replace_last(self, *values):
+        # The last bar changed (a forming daily/weekly/monthly bar): undo it
+        # and apply the new values instead.
+        if self._previous is None:
+            raise ValueError("No bar to replace")
+        self._restore(self._previous)
+        self.last_values = [float(value) for value in values]
+        return self._step(*values)
+    
+    def push(self, time, *values):
+        # Timestamped update: the same bar again replaces it, a new bar advances.
+        if self.last_time is not None:
+            last = pd.Timestamp(self.last_time)
+            time = pd.Timestamp(time)
+            if time == last:
+                return self.replace_last(*values)
+            if time < last:
+                raise ValueError(f"Bar at {time} is older than the last one ({last})")
+        return self.update(*values, time=time)
+    
+    def to_dict(self) -> dict:
+        return {
+            "type": type(self).__name__,
+            "params": self.params(),
+            "state": self._state(),
+            "previous": self._previous,
+            "last_time": self.last_time,
+            "last_values": self.last_values,
+            "anchor_time": self.anchor_time,
+            "anchor_values": self.anchor_values,
+            "first_time": self.first_time,
+            "first_values": self.first_values,
+        }
+    
+    @staticmethod
+    def from_dict(data: dict) -> 'StreamingState':
+        state = _STATE_TYPES[data["type"]](**data["params"])
+        state._restore(data["state"])
+        state._previous = data["previous"]
+        state.last_time = data["last_time"]
+        state.last_values = data["last_values"]
+        state.anchor_time = data["anchor_time"]
+        state.anchor_values = data["anchor_values"]
+        state.first_time = data["first_time"]
+        state.first_values = data["first_values"]
+        return state
+    
+    @abstractmethod
+    def seed(self, *values: np.ndarray):
+        # Vectorized run over a history: sets the state as if every bar had
+        # gone through _step and returns the indicator series.
+        pass
+    
+    @classmethod
+    def from_history(cls, df: pd.DataFrame, *args, **params) -> 'StreamingState':
+        # Seeds on all bars but the last, which goes through update so it can
+        # be replaced while it's still forming.
+        state = cls(*args, **params)
+        bars = df[list(cls._columns)].to_numpy(dtype=np.float64)
+        state.seed(*bars[:-1].T)
+        if isinstance(df.index, pd.DatetimeIndex):
+            state.first_time = df.index[0].isoformat()
+            state.first_values = bars[0].tolist()
+        if len(df) > 1 and isinstance(df.index, pd.DatetimeIndex):
+            state.anchor_time = df.index[-2].isoformat()
+            state.anchor_values = bars[-2].tolist()
+        state.update(*bars[-1], time=_last_time(df))
+        return state
+    
+    def catch_up(self, df: pd.DataFrame) -> int:
+        # Pushes the bars of df from the last one seen on (the forming bar is
+        # replaced, newer ones advance) and returns how many. Raises
+        # ValueError when df no longer contains the bars the state was built
+        # on, e.g. after a split or dividend adjustment, or when its window
+        # starts at a different bar (a sliding period): seed it again.
+        if self.last_time is None:
+            raise ValueError("State has no timestamps to catch up from")
+        bars = df[list(self._columns)]
+        
+        if self.first_time is not None:
+            first = pd.Timestamp(self.first_time)
+            if df.index[0] != first or bars.iloc[0].to_numpy(dtype=np.float64).tolist() != self.first_values:
+                raise ValueError(f"History window moved from {first} to {df.index[0]}")
+        if self.anchor_time is not None:
+            anchor = pd.Timestamp(self.anchor_time)
+            if anchor not in df.index or bars.loc[anchor].to_numpy(dtype=np.float64).tolist() != self.anchor_values:
+                raise ValueError(f"History changed at {anchor}")
+        last = pd.Timestamp(self.last_time)
+        if last not in df.index:
+            raise ValueError(f"History no longer has the bar at {last}")
+        
+        new = bars[df.index >= last]
+        for time, row in zip(new.index, new.to_numpy(dtype=np.float64)):
+            self.push(time, *row)
+        return len(new)
+
+
+class EWMState(StreamingState):
+    # Series.ewm(span=... or alpha=..., adjust=False).mean(), NaN handling included.
+    _fields = ("value", "old_wt")
+    
+    def __init__(self, span: Optional[float] = None, alpha: Optional[float] = None):
+        super().__init__()
+        self.span = span
+        self.alpha = alpha
+        # Same center-of-mass round trip as pandas.
+        com = (span - 1) / 2.0 if span is not None else (1.0 - alpha) / alpha
+        self._new_wt = 1. / (1. + com)
+        self._old_wt_factor = 1. - self._new_wt
+        self.value = float('nan')
+        self.old_wt = 1.
+    
+    def params(self) -> dict:
+        return {"span": self.span, "alpha": self.alpha}
+    
+    def _step(self, cur: float) -> float:
+        cur = float(cur)
+        if self.value == self.value:
+            self.old_wt *= self._old_wt_factor
+            if cur == cur:
+                if self.value != cur:
+                    self.value = (self.old_wt * self.value + self._new_wt * cur) / (self.old_wt + self._new_wt)
+                self.old_wt = 1.
+        elif cur == cur:
+            self.value = cur
+        return self.value
+    
+    def seed(self, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        output = pd.Series(values).ewm(span=self.span, alpha=self.alpha, adjust=False).mean().to_numpy()
+        
+        observed = np.flatnonzero(~np.isnan(values))
+        self.value = float(output[-1]) if len(observed) else float('nan')
+        self.old_wt = 1.
+        # Missing bars after the last observation keep decaying its weight.
+        for _ in range(len(values) - 1 - observed[-1] if len(observed) else 0):
+            self.old_wt *= self._old_wt_factor
+        return output
+
+
+class EMAState(EWMState):
+    def __init__(self, period: int):
+        super().__init__(span=period)
+        self.period = period
+    
+    def params(self) -> dict:
+        return {"period": self.period}
+
+
+class RSIState(StreamingState):
+    # Wilder RSI as calculate_rsi computes it.
+    _fields = ("prev",)
+    _children = ("avg_gain", "avg_loss")
+    
+    def __init__(self, period: int):
+        super().__init__()
+        self.period = period
+        self.prev = float('nan')
+        self.avg_gain = EWMState(alpha=1.0 / period)
+        self.avg_loss = EWMState(alpha=1.0 / period)
+    
+    def params(self) -> dict:
+        return {"period": self.period}
+    
+    @staticmethod
+    def _rsi(avg_gain, avg_loss):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = np.float64(avg_gain) / np.float64(avg_loss)
+            return 100 - (100 / (1 + rs))
+    
+    def _step(self, cur: float) -> float:
+        cur = float(cur)
+        delta = cur - self.prev
+        self.prev = cur
+        gain = delta if delta > 0 else 0.0
+        loss = -(delta if delta < 0 else 0.0)
+        return float(self._rsi(self.avg_gain._step(gain), self.avg_loss._step(loss)))
+    
+    def seed(self, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        delta = np.diff(values, prepend=np.nan)
+        with np.errstate(invalid='ignore'):
+            gain = np.where(delta > 0, delta, 0.0)
+            loss = -np.where(delta < 0, delta, 0.0)
+        
+        self.prev = float(values[-1]) if len(values) else float('nan')
+        return self._rsi(self.avg_gain.seed(gain), self.avg_loss.seed(loss))
+
+
+class T3State(StreamingState):
+    _children = ("xe1", "xe2", "xe3", "xe4", "xe5", "xe6")
+    
+    def __init__(self, period: int):
+        super().__init__()
+        self.period = period
+        for name in self._children:
+            setattr(self, name, EMAState(period))
+        
+        b = 0.7
+        self._c = (-b**3, 3*b**2 + 3*b**3, -6*b**2 - 3*b - 3*b**3, 1 + 3*b + b**3 + 3*b**2)
+    
+    def params(self) -> dict:
+        return {"period": self.period}
+    
+    def _combine(self, xe3, xe4, xe5, xe6):
+        c1, c2, c3, c4 = self._c
+        return c1 * xe6 + c2 * xe5 + c3 * xe4 + c4 * xe3
+    
+    def _step(self, cur: float) -> float:
+        values = []
+        for name in self._children:
+            cur = getattr(self, name)._step(cur)
+            values.append(cur)
+        return self._combine(*values[2:])
+    
+    def seed(self, values: np.ndarray) -> np.ndarray:
+        series = []
+        for name in self._children:
+            values = getattr(self, name).seed(values)
+            series.append(values)
+        return self._combine(*series[2:])
+
+
+class BXTrenderState(StreamingState):
+    # calculate_bx_trender on closes, plus the previous value for the color.
+    _fields = ("value", "prev_value")
+    _children = ("ema_fast", "ema_slow", "rsi", "t3")
+    
+    def __init__(
+        self,
+        short_l1: int = 5,
+        short_l2: int = 20,
+        short_l3: int = 15,
+        long_l1: int = 20,
+        long_l2: int = 15,
+        use_short: bool = True,
+        apply_t3: bool = False
+    ):
+        super().__init__()
+        self.short_l1, self.short_l2, self.short_l3 = short_l1, short_l2, short_l3
+        self.long_l1, self.long_l2 = long_l1, long_l2
+        self.use_short = use_short
+        self.apply_t3 = apply_t3
+        
+        self.ema_fast = EMAState(short_l1 if use_short else long_l1)
+        self.ema_slow = EMAState(short_l2)
+        self.rsi = RSIState(short_l3 if use_short else long_l2)
+        self.t3 = T3State(5)
+        self.value = float('nan')
+        self.prev_value = float('nan')
+    
+    def params(self) -> dict:
+        return {
+            "short_l1": self.short_l1, "short_l2": self.short_l2, "short_l3": self.short_l3,
+            "long_l1": self.long_l1, "long_l2": self.long_l2,
+            "use_short": self.use_short, "apply_t3": self.apply_t3,
+        }
+    
+    def _step(self, close: float) -> float:
+        if self.use_short:
+            ema_diff = self.ema_fast._step(close) - self.ema_slow._step(close)
+            value = self.rsi._step(ema_diff) - 50
+            if self.apply_t3:
+                value = self.t3._step(value)
+        else:
+            value = self.rsi._step(self.ema_fast._step(close)) - 50
+        
+        self.prev_value, self.value = self.value, value
+        return value
+    
+    def seed(self, close: np.ndarray) -> np.ndarray:
+        if self.use_short:
+            ema_diff = self.ema_fast.seed(close) - self.ema_slow.seed(close)
+            series = self.rsi.seed(ema_diff) - 50
+            if self.apply_t3:
+                series = self.t3.seed(series)
+        else:
+            series = self.rsi.seed(self.ema_fast.seed(close)) - 50
+        
+        self.value = float(series[-1]) if len(series) else float('nan')
+        self.prev_value = float(series[-2]) if len(series) > 1 else float('nan')
+        return series
+    
+    def color(self) -> BXTrenderColor:
+        return get_bx_trender_color(self.value, self.prev_value)
+    
+    def result(self) -> BXTrenderResult:
+        # Same as get_latest_bx_trender on the bars seen so far.
+        color = self.color()
+        return BXTrenderResult(value=float(self.value), color=color, is_uptrend=color != BXTrenderColor.DARK_RED)
+
+
+class MarketBiasState(StreamingState):
+    # calculate_market_bias: Heikin-Ashi on EMA(ha_len) bars, then EMA(ha_len2)
+    # of the HA high and low.
+    _fields = ("bars", "haopen", "haclose", "close", "bias_high", "bias_low")
+    _children = ("ema_open", "ema_high", "ema_low", "ema_close", "ema_ha_high", "ema_ha_low")
+    _columns = ("open", "high", "low", "close")
+    
+    def __init__(self, ha_len: int = 20, ha_len2: int = 7):
+        super().__init__()
+        self.ha_len = ha_len
+        self.ha_len2 = ha_len2
+        for name in self._children[:4]:
+            setattr(self, name, EMAState(ha_len))
+        for name in self._children[4:]:
+            setattr(self, name, EMAState(ha_len2))
+        
+        self.bars = 0
+        self.haopen = float('nan')
+        self.haclose = float('nan')
+        self.close = float('nan')
+        self.bias_high = float('nan')
+        self.bias_low = float('nan')
+    
+    def params(self) -> dict:
+        return {"ha_len": self.ha_len, "ha_len2": self.ha_len2}
+    
+    def _step(self, open_: float, high: float, low: float, close: float) -> Tuple[float, float]:
+        o = self.ema_open._step(open_)
+        c = self.ema_close._step(close)
+        h = self.ema_high._step(high)
+        l = self.ema_low._step(low)
+        
+        haclose = (o + h + l + c) / 4
+        haopen = (o + c) / 2 if self.bars == 0 else (self.haopen + self.haclose) / 2
+        hahigh = _fmax(_fmax(h, haopen), haclose)
+        halow = _fmin(_fmin(l, haopen), haclose)
+        
+        self.bars += 1
+        self.haopen, self.haclose, self.close = haopen, haclose, close
+        self.bias_high = self.ema_ha_high._step(hahigh)
+        self.bias_low = self.ema_ha_low._step(halow)
+        return self.bias_high, self.bias_low
+    
+    def seed(self, open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        o = self.ema_open.seed(open_)
+        c = self.ema_close.seed(close)
+        h = self.ema_high.seed(high)
+        l = self.ema_low.seed(low)
+        
+        haclose = (o + h + l + c) / 4
+        haopen = heikin_ashi_open((o + c) / 2, haclose)
+        h2 = self.ema_ha_high.seed(np.fmax(np.fmax(h, haopen), haclose))
+        l2 = self.ema_ha_low.seed(np.fmin(np.fmin(l, haopen), haclose))
+        
+        self.bars = len(close)
+        if self.bars:
+            self.haopen, self.haclose = float(haopen[-1]), float(haclose[-1])
+            self.close = float(close[-1])
+            self.bias_high, self.bias_low = float(h2[-1]), float(l2[-1])
+        return h2, l2
+    
+    def result(self, timeframe: Timeframe) -> MarketBiasResult:
+        # Same as check_market_bias on the bars seen so far.
+        return MarketBiasResult(
+            timeframe=timeframe.value,
+            in_range=self.bias_low <= self.close <= self.bias_high,
+            price=float(self.close),
+            bias_low=float(self.bias_low),
+            bias_high=float(self.bias_high)
+        )
+
+
+def _last_time(df: pd.DataFrame) -> Optional[pd.Timestamp]:
+    return df.index[-1] if isinstance(df.index, pd.DatetimeIndex) else None
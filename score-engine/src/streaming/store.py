@@ -0,0 +1,22 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, Union
+from .states import StreamingState
+
+
+def save_states(path: Union[str, Path], states: Dict[str, StreamingState]) -> None:
+    # One JSON file per set of states (e.g. per symbol), replaced atomically
+    # so a crash never leaves half a file behind.
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump({name: state.to_dict() for name, state in states.items()}, f)
+    os.replace(tmp_path, path)
+
+
+def load_states(path: Union[str, Path]) -> Dict[str, StreamingState]:
+    with open(path) as f:
+        data = json.load(f)
+    return {name: StreamingState.from_dict(state) for name, state in data.items()}
@@ -0,0 +1,72 @@
+import pandas as pd
+from typing import Dict, Optional
+from ..context import IndicatorContext
+from ..scoring.fibonacci_scorer import score_fibonacci
+from ..types import BXTrenderColor, ScoreBreakdown, StockScore, Timeframe
+from .states import BXTrenderState, MarketBiasState, StreamingState
+
+
+# The states calculate_stock_score reads, kept per symbol between scans so
+# each scan only pushes the bars that are new since the last one.
+
+def seed_symbol_states(
+    df_monthly: pd.DataFrame,
+    df_weekly: pd.DataFrame,
+    ha_len: int = 20,
+    ha_len2: int = 7
+) -> Dict[str, StreamingState]:
+    return {
+        "monthly_bx": BXTrenderState.from_history(df_monthly),
+        "monthly_bias": MarketBiasState.from_history(df_monthly, ha_len, ha_len2),
+        "weekly_bias": MarketBiasState.from_history(df_weekly, ha_len, ha_len2),
+    }
+
+
+def catch_up_symbol_states(
+    states: Dict[str, StreamingState],
+    df_monthly: pd.DataFrame,
+    df_weekly: pd.DataFrame
+) -> int:
+    # Raises ValueError (from catch_up) when the states must be seeded again.
+    return (
+        states["monthly_bx"].catch_up(df_monthly)
+        + states["monthly_bias"].catch_up(df_monthly)
+        + states["weekly_bias"].catch_up(df_weekly)
+    )
+
+
+def score_symbol_states(
+    symbol: str,
+    states: Dict[str, StreamingState],
+    fib_df: pd.DataFrame,
+    fib_lookback: int = 50,
+    context: Optional[IndicatorContext] = None
+) -> StockScore:
+    # calculate_stock_score with the BX-Trender and market bias read from the
+    # states; Fibonacci pivots still need the daily history.
+    if states["monthly_bias"].bars < 2:
+        raise ValueError(f"{symbol}: need at least two monthly bars")
+    
+    bx_result = states["monthly_bx"].result()
+    
+    if states["monthly_bias"].result(Timeframe.MONTHLY).in_range:
+        market_bias_score, market_bias_tf = 6, Timeframe.MONTHLY
+    elif states["weekly_bias"].result(Timeframe.WEEKLY).in_range:
+        market_bias_score, market_bias_tf = 3, Timeframe.WEEKLY
+    else:
+        market_bias_score, market_bias_tf = 0, None
+    
+    fibonacci_score, fibonacci_zone, _ = score_fibonacci(fib_df, fib_lookback, context)
+    
+    return StockScore(
+        symbol=symbol,
+        score_breakdown=ScoreBreakdown(
+            market_bias_score=market_bias_score,
+            market_bias_timeframe=market_bias_tf,
+            fibonacci_score=fibonacci_score,
+            fibonacci_zone=fibonacci_zone,
+            total_score=market_bias_score + fibonacci_score,
+            passed_filter=bx_result.color != BXTrenderColor.DARK_RED,
+            bx_trender_color=bx_result.color
+        )
+    )